@@ -1,23 +1,45 @@
 import matplotlib.pyplot as plt
+import numpy as np
 from wordcloud import WordCloud
 from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-import spacy
-
-# Chargement du modèle spaCy français
-nlp = spacy.load("fr_core_news_sm")
-
-def analyse_frequence(mots):
-    """Étape 3.1 : Compter les mots les plus fréquents"""
-    compteur = Counter(mots)
+from cache_nlp import analyser, analyser_lot
+from index_entites import indexer_entites
+from tfidf import ajuster_tfidf, transformer_tfidf, mots_tfidf
+from nuages import rendre_wordcloud
+from mesures import chronometrer
+
+@chronometrer("analyse_frequence")
+def analyse_frequence(mots, vocabulaire=None, esquisse=None):
+    """
+    Étape 3.1 : Compter les mots les plus fréquents
+    - vocabulaire : si renseigné, mots est un tableau d'identifiants (voir corpus_ids.py),
+      compté avec np.bincount au lieu de Counter
+    - esquisse : FrequencesApprochees (voir esquisses.py) alimentée avec mots et renvoyée
+      à la place d'un Counter : mémoire constante sur un flux continu de documents
+    """
+    if esquisse is not None:
+        compteur = esquisse.ajouter(mots)
+    elif vocabulaire is None:
+        compteur = Counter(mots)
+    else:
+        comptes = np.bincount(mots, minlength=len(vocabulaire))
+        compteur = Counter({vocabulaire[i]: int(comptes[i]) for i in np.flatnonzero(comptes)})
     print("\n🔢 Mots les plus fréquents :")
     for mot, freq in compteur.most_common(10):
         print(f"{mot} : {freq}")
 
     return compteur
 
-def generer_wordcloud(compteur):
-    """Visualisation avec un nuage de mots"""
+def generer_wordcloud(compteur, destination=None, format="png"):
+    """
+    Visualisation avec un nuage de mots
+    - compteur : Counter ou esquisse FrequencesApprochees (ses mots suivis sont dessinés)
+    - destination : si renseignée (chemin ou fichier binaire), l'image y est écrite
+      en PNG / SVG sans fenêtre (voir nuages.py)
+    """
+    if destination is not None:
+        return rendre_wordcloud(compteur, destination, format=format)
+
     wordcloud = WordCloud(width=800, height=400, background_color='white')
     wordcloud.generate_from_frequencies(compteur)
     
@@ -27,17 +49,20 @@ def generer_wordcloud(compteur):
     plt.title("Nuage de mots")
     plt.show()
 
-def analyse_tfidf(listes_mots):
-    """TF-IDF même si un seul document"""
+@chronometrer("analyse_tfidf")
+def analyse_tfidf(listes_mots, modele=None):
+    """
+    TF-IDF même si un seul document
+    - modele : modèle TF-IDF déjà ajusté (voir tfidf.py), sinon ajusté sur listes_mots
+    """
     print("\n📊 Analyse TF-IDF")
 
-    documents = [" ".join(mots) for mots in listes_mots]
-    
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(documents)
-    
-    features = vectorizer.get_feature_names_out()
-    for i, doc in enumerate(documents):
+    if modele is None:
+        modele = ajuster_tfidf(listes_mots)
+    tfidf_matrix = transformer_tfidf(modele, listes_mots)
+
+    features = mots_tfidf(modele)
+    for i in range(len(listes_mots)):
         print(f"\n📄 Document {i + 1} :")
         tfidf_scores = tfidf_matrix[i].tocoo()
         sorted_items = sorted(zip(tfidf_scores.col, tfidf_scores.data), key=lambda x: x[1], reverse=True)
@@ -45,25 +70,53 @@ def analyse_tfidf(listes_mots):
             print(f"{features[idx]} : {score:.4f}")
 
 
-def analyse_ner(mots):
-    """Étape 3.3 : Détection des entités nommées"""
+def regrouper_entites(doc):
+    """Entités d'un Doc : liste (texte, type) et regroupement par type, en un seul parcours"""
+    entites = []
+    par_type = {"PER": [], "LOC": [], "ORG": []}
+    for ent in doc.ents:
+        entites.append((ent.text, ent.label_))
+        par_type.setdefault(ent.label_, []).append(ent.text)
+    return {"entites": entites, "par_type": par_type}
+
+@chronometrer("analyse_ner")
+def analyse_ner(texte):
+    """
+    Étape 3.3 : Détection des entités nommées
+    - texte : texte brut de préférence ; le modèle s'appuie sur les majuscules, que les mots
+      nettoyés ont perdues (une liste de mots reste acceptée)
+    """
     print("\n🧠 Entités nommées détectées (NER) :")
-    texte = " ".join(mots)
-    doc = nlp(texte)
+    if isinstance(texte, list):
+        texte = " ".join(texte)
+    doc = analyser(texte, "ner")
 
-    entites = [(ent.text, ent.label_) for ent in doc.ents]
-    for ent in entites:
+    resultat = regrouper_entites(doc)
+    for ent in resultat["entites"]:
         print(f"{ent[0]} → {ent[1]}")
 
     # Optionnel : Regrouper par type
-    personnes = [ent.text for ent in doc.ents if ent.label_ == "PER"]
-    lieux = [ent.text for ent in doc.ents if ent.label_ == "LOC"]
-    organisations = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
-
     print("\n📍 Résumé des entités :")
-    print("Personnes :", personnes)
-    print("Lieux     :", lieux)
-    print("Organisations :", organisations)
+    print("Personnes :", resultat["par_type"]["PER"])
+    print("Lieux     :", resultat["par_type"]["LOC"])
+    print("Organisations :", resultat["par_type"]["ORG"])
+    return resultat
+
+@chronometrer("analyse_ner_lot")
+def analyse_ner_lot(documents, index=None, batch_size=100, n_process=1):
+    """
+    NER par lots sur des textes bruts
+    - documents : itérable de (identifiant, texte)
+    - index : connexion à un index d'entités (voir index_entites.py), mis à jour lot par lot
+    Renvoie une liste de (identifiant, regrouper_entites(doc)), dans l'ordre des documents
+    (un identifiant répété garde chacun de ses résultats).
+    """
+    documents = list(documents)
+    docs = analyser_lot((texte for _, texte in documents), "ner", batch_size=batch_size, n_process=n_process)
+    resultats = [(identifiant, regrouper_entites(doc)) for (identifiant, _), doc in zip(documents, docs)]
+    if index is not None:
+        indexer_entites(index, ((identifiant, resultat["entites"]) for identifiant, resultat in resultats))
+    return resultats
 
 def analyser_liste_mots(liste_mots, autres_textes=None):
     """
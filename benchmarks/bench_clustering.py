@@ -0,0 +1,85 @@
+"""
+Benchmark du clustering des textes inconnus : temps et pic mémoire selon la taille du corpus
+
+Compare, sur un corpus synthétique de listes de mots :
+- kmeans : KMeans sur toute la matrice TF-IDF (comportement historique)
+- minibatch : MiniBatchKMeans sur toute la matrice
+- minibatch+svd : idem après réduction TruncatedSVD
+- flux : MiniBatchKMeans.partial_fit lot par lot (clusteriser_flux)
+
+Le pic mémoire est mesuré avec tracemalloc (allocations Python et NumPy).
+
+Utilisation : python benchmarks/bench_clustering.py [--tailles 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from clustering import clusteriser_matrice, clusteriser_flux
+from tfidf import ajuster_tfidf, transformer_tfidf
+
+def generer_corpus(nb_documents, nb_sujets=8, mots_par_sujet=200, longueur=80, graine=42):
+    """Corpus synthétique : chaque document tire ses mots dans le vocabulaire d'un sujet, plus du bruit"""
+    rng = random.Random(graine)
+    sujets = [[f"s{s}_mot{m}" for m in range(mots_par_sujet)] for s in range(nb_sujets)]
+    bruit = [f"commun{m}" for m in range(mots_par_sujet)]
+    corpus = []
+    for _ in range(nb_documents):
+        sujet = rng.choice(sujets)
+        corpus.append([rng.choice(sujet) if rng.random() < 0.7 else rng.choice(bruit) for _ in range(longueur)])
+    return corpus
+
+def mesurer(fonction):
+    """Exécuter fonction() et renvoyer (durée en s, pic mémoire en Mo)"""
+    tracemalloc.start()
+    debut = time.perf_counter()
+    fonction()
+    duree = time.perf_counter() - debut
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duree, pic / 1024 / 1024
+
+def scenarios(corpus, n_clusters, taille_lot):
+    """Associe à chaque nom de scénario la fonction à mesurer"""
+    def en_memoire(methode, n_composantes=None):
+        modele = ajuster_tfidf(corpus)
+        X = transformer_tfidf(modele, corpus)
+        return clusteriser_matrice(X, methode=methode, n_clusters=n_clusters, n_composantes=n_composantes)
+
+    def par_lots():
+        def lots():
+            for debut in range(0, len(corpus), taille_lot):
+                yield corpus[debut:debut + taille_lot]
+        modele = ajuster_tfidf(corpus)
+        return clusteriser_flux(lots, modele, n_clusters=n_clusters, n_composantes=100)
+
+    return {
+        "kmeans": lambda: en_memoire("kmeans"),
+        "minibatch": lambda: en_memoire("minibatch"),
+        "minibatch+svd": lambda: en_memoire("minibatch", n_composantes=100),
+        "flux": par_lots,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tailles", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--n-clusters", default="8", help="Nombre de clusters ou 'auto'")
+    parser.add_argument("--taille-lot", type=int, default=5000)
+    parser.add_argument("--sans-kmeans", action="store_true", help="Ignorer KMeans complet (lent sur gros corpus)")
+    args = parser.parse_args()
+    n_clusters = args.n_clusters if args.n_clusters == "auto" else int(args.n_clusters)
+
+    print(f"{'Documents':>10} {'Scénario':<14} {'Durée (s)':>10} {'Pic mémoire (Mo)':>17}")
+    for taille in args.tailles:
+        corpus = generer_corpus(taille)
+        for nom, fonction in scenarios(corpus, n_clusters, args.taille_lot).items():
+            if nom == "kmeans" and args.sans_kmeans:
+                continue
+            duree, pic = mesurer(fonction)
+            print(f"{taille:>10} {nom:<14} {duree:>10.2f} {pic:>17.1f}")
@@ -0,0 +1,186 @@
+"""
+Benchmark de chaque étape d'analyse sur un corpus synthétique ou fourni
+
+Étapes mesurées : charger_fichier, nettoyer_texte, analyse_frequence, analyse_tfidf,
+analyse_ner, detecter_theme_par_motcles, clusteriser_textes, identifier_phrase_cle,
+resumer_texte. Pour chacune : durée totale, débit (documents/s) et pic mémoire de l'étape
+(allocations Python/NumPy suivies par tracemalloc, lors d'une seconde exécution pour ne pas
+fausser les durées ; --sans-memoire pour l'omettre). Les allocations natives hors de
+l'allocateur Python (BLAS, OpenMP, certaines extensions) n'y figurent pas.
+Les résultats sont écrits en JSON pour pouvoir comparer deux exécutions (--comparer).
+
+Le cache d'analyses spaCy est désactivé par défaut pour mesurer le vrai coût du parsing.
+
+Utilisation :
+  python benchmarks/bench_etapes.py --documents 1000 --longueur courte --sortie resultats.json
+  python benchmarks/bench_etapes.py --corpus corpus.jsonl --comparer reference.json
+"""
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from cache_nlp import configurer_cache
+from corpus_synthetique import LONGUEURS, generer_corpus
+from mesures import CONFIG as CONFIG_MESURES, MESURES, activer_mesures, reinitialiser_mesures
+from modele_nlp import charger_modele
+
+ETAPES = [
+    "charger_fichier", "nettoyer_texte", "analyse_frequence", "analyse_tfidf", "analyse_ner",
+    "detecter_theme_par_motcles", "clusteriser_textes", "identifier_phrase_cle", "resumer_texte",
+]
+
+# Écart relatif de durée au-delà duquel une étape est signalée comme régression
+SEUIL_REGRESSION = 0.10
+
+def charger_script(nom_fichier):
+    """Importer un script du dépôt (les noms avec tiret ne sont pas importables directement)"""
+    spec = importlib.util.spec_from_file_location(nom_fichier[:-3].replace("-", "_"), os.path.join(RACINE, nom_fichier))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def pic_memoire_mo(fonction):
+    """
+    Pic des allocations Python/NumPy faites pendant l'appel, en Mo (suivies par tracemalloc)
+    Le RSS maximal du processus (ru_maxrss) ne redescend jamais : il ne dit rien d'une étape
+    qui suit une étape plus gourmande. tracemalloc, démarré juste avant, ne voit que l'étape.
+    Le chronométrage est suspendu : cette exécution, ralentie, ne compte pas dans MESURES.
+    """
+    actif, CONFIG_MESURES["actif"] = CONFIG_MESURES["actif"], False
+    tracemalloc.start()
+    try:
+        with open(os.devnull, 'w') as nul, contextlib.redirect_stdout(nul):
+            fonction()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+        CONFIG_MESURES["actif"] = actif
+
+def lire_corpus_jsonl(chemin, champ="texte"):
+    with open(chemin, 'r', encoding='utf-8') as f:
+        return [json.loads(ligne)[champ] for ligne in f if ligne.strip()]
+
+def executer(textes, etapes, memoire=True):
+    """
+    Exécuter les étapes demandées sur le corpus et renvoyer les mesures par étape
+    - memoire : réexécuter chaque étape sous tracemalloc pour mesurer son pic mémoire
+    """
+    nettoyage = charger_script("clear-text.py")
+    analyse = charger_script("analyse-text.py")
+    classification = charger_script("classification_text.py")
+    detection = charger_script("detection-sujet.py")
+    extraction = charger_script("extraction_sujet.py")
+
+    # Modèles chargés avant les mesures : on chronomètre les étapes, pas le démarrage à froid
+    for profil in ("lemmes", "ner", "phrases"):
+        charger_modele(profil)
+
+    resultats = {}
+    def mesurer(etape, nb_documents, fonction):
+        debut = time.perf_counter()
+        with open(os.devnull, 'w') as nul, contextlib.redirect_stdout(nul):
+            sortie = fonction()
+        duree = time.perf_counter() - debut
+        if etape in etapes:
+            resultats[etape] = {
+                "duree_s": round(duree, 4),
+                "documents_par_s": round(nb_documents / duree, 2) if duree else None,
+                "pic_memoire_mo": round(pic_memoire_mo(fonction), 1) if memoire else None,
+            }
+        return sortie
+
+    n = len(textes)
+    with tempfile.TemporaryDirectory() as dossier:
+        chemins = []
+        for i, texte in enumerate(textes):
+            chemins.append(os.path.join(dossier, f"{i}.txt"))
+            with open(chemins[-1], 'w', encoding='utf-8') as f:
+                f.write(texte)
+        mesurer("charger_fichier", n, lambda: [nettoyage.charger_fichier(chemin) for chemin in chemins])
+
+    # Les listes de mots nettoyés servent d'entrée aux étapes suivantes
+    listes_mots = mesurer("nettoyer_texte", n, lambda: [nettoyage.nettoyer_texte(texte) for texte in textes])
+
+    etapes_suivantes = [
+        ("analyse_frequence", lambda: [analyse.analyse_frequence(mots) for mots in listes_mots]),
+        ("analyse_tfidf", lambda: analyse.analyse_tfidf(listes_mots)),
+        ("analyse_ner", lambda: [analyse.analyse_ner(texte) for texte in textes]),
+        ("detecter_theme_par_motcles", lambda: [classification.detecter_theme_par_motcles(mots) for mots in listes_mots]),
+        ("clusteriser_textes", lambda: detection.clusteriser_textes(listes_mots, n_clusters="auto", methode="minibatch")),
+        ("identifier_phrase_cle", lambda: [extraction.identifier_phrase_cle(texte) for texte in textes]),
+        ("resumer_texte", lambda: [extraction.resumer_texte(texte) for texte in textes]),
+    ]
+    for etape, fonction in etapes_suivantes:
+        if etape in etapes:
+            mesurer(etape, n, fonction)
+    return resultats
+
+def comparer(resultats, reference):
+    """Afficher l'évolution des durées par rapport à une exécution de référence"""
+    print(f"\n{'Étape':<28} {'Référence (s)':>14} {'Actuel (s)':>11} {'Écart':>8}")
+    for etape, mesure in resultats["etapes"].items():
+        ancienne = reference["etapes"].get(etape)
+        if not ancienne:
+            continue
+        ecart = mesure["duree_s"] / ancienne["duree_s"] - 1 if ancienne["duree_s"] else 0
+        alerte = "  ⚠️ régression" if ecart > SEUIL_REGRESSION else ""
+        print(f"{etape:<28} {ancienne['duree_s']:>14.3f} {mesure['duree_s']:>11.3f} {ecart:>+8.1%}{alerte}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100, help="Taille du corpus synthétique")
+    parser.add_argument("--longueur", choices=LONGUEURS, default="moyenne")
+    parser.add_argument("--corpus", help="Corpus .jsonl à utiliser à la place du corpus synthétique")
+    parser.add_argument("--etapes", default=",".join(ETAPES), help="Étapes séparées par des virgules")
+    parser.add_argument("--avec-cache", action="store_true", help="Garder le cache d'analyses spaCy")
+    parser.add_argument("--sans-memoire", action="store_true", help="Ne pas mesurer le pic mémoire des étapes")
+    parser.add_argument("--sortie", help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--comparer", help="Résultats JSON d'une exécution de référence")
+    args = parser.parse_args()
+
+    if not args.avec_cache:
+        configurer_cache(actif=False)
+    textes = lire_corpus_jsonl(args.corpus) if args.corpus else generer_corpus(args.documents, args.longueur)
+    etapes = [etape.strip() for etape in args.etapes.split(",") if etape.strip()]
+
+    # Les crochets de chronométrage de la bibliothèque donnent la durée des appels individuels
+    reinitialiser_mesures()
+    activer_mesures()
+    mesures_etapes = executer(textes, etapes, memoire=not args.sans_memoire)
+    for etape, mesure in mesures_etapes.items():
+        if etape in MESURES:
+            mesure["duree_max_appel_s"] = round(MESURES[etape]["duree_max_s"], 4)
+
+    resultats = {
+        "parametres": {
+            "documents": len(textes),
+            "caracteres": sum(len(texte) for texte in textes),
+            "longueur": None if args.corpus else args.longueur,
+            "corpus": args.corpus,
+            "cache": args.avec_cache,
+        },
+        "environnement": {"python": platform.python_version(), "machine": platform.machine()},
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "etapes": mesures_etapes,
+    }
+
+    print(f"{'Étape':<28} {'Durée (s)':>10} {'Docs/s':>10} {'Pic mém. (Mo)':>14}")
+    for etape, mesure in mesures_etapes.items():
+        print(f"{etape:<28} {mesure['duree_s']:>10.3f} {mesure['documents_par_s'] or 0:>10.1f} {mesure['pic_memoire_mo'] or 0:>14.1f}")
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, ensure_ascii=False, indent=2)
+    if args.comparer:
+        with open(args.comparer, 'r', encoding='utf-8') as f:
+            comparer(resultats, json.load(f))
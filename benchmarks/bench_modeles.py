@@ -0,0 +1,73 @@
+"""
+Benchmark du chargement spaCy : démarrage, RSS et latence par document
+
+Chaque scénario tourne dans un processus Python séparé pour mesurer
+la mémoire de façon isolée.
+- ancien : cinq spacy.load complets, comme quand chaque script chargeait son modèle à l'import
+- un scénario par profil de modele_nlp (modèle partagé, composants réduits)
+
+Utilisation : python benchmarks/bench_modeles.py [--repetitions 20]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from modele_nlp import PROFILS
+
+# Code exécuté dans le sous-processus : affiche une ligne JSON de mesures
+SCENARIO = """
+import json, resource, sys, time
+sys.path.insert(0, {racine!r})
+import spacy
+from modele_nlp import NOM_MODELE, charger_modele
+
+scenario, repetitions = {scenario!r}, {repetitions}
+with open({texte!r}, encoding="utf-8") as f:
+    texte = f.read()
+
+debut = time.perf_counter()
+if scenario == "ancien":
+    modeles = [spacy.load(NOM_MODELE) for _ in range(5)]
+    nlp = modeles[0]
+else:
+    nlp = charger_modele(scenario)
+demarrage = time.perf_counter() - debut
+
+debut = time.perf_counter()
+for _ in range(repetitions):
+    nlp(texte)
+latence = (time.perf_counter() - debut) / repetitions
+
+print(json.dumps({{
+    "scenario": scenario,
+    "composants": nlp.pipe_names,
+    "demarrage_s": round(demarrage, 3),
+    "latence_ms": round(latence * 1000, 2),
+    "rss_max_mo": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+}}))
+"""
+
+def mesurer(scenario, repetitions, chemin_texte):
+    """Lancer un scénario dans un processus neuf et renvoyer ses mesures"""
+    code = SCENARIO.format(racine=RACINE, scenario=scenario, repetitions=repetitions, texte=chemin_texte)
+    sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=20)
+    parser.add_argument("--texte", default=os.path.join(RACINE, "mon_texte.txt"))
+    args = parser.parse_args()
+
+    print(f"{'Scénario':<10} {'Démarrage (s)':>14} {'Latence (ms)':>13} {'RSS max (Mo)':>13}  Composants")
+    for scenario in ["ancien", *PROFILS]:
+        resultat = mesurer(scenario, args.repetitions, args.texte)
+        print(
+            f"{resultat['scenario']:<10} {resultat['demarrage_s']:>14} {resultat['latence_ms']:>13} "
+            f"{resultat['rss_max_mo']:>13}  {', '.join(resultat['composants'])}"
+        )
@@ -0,0 +1,72 @@
+"""
+Benchmark de la normalisation du texte avant spaCy
+
+Compare sur des textes de plusieurs Mo (mon_texte.txt répété) :
+- ancienne chaîne : lower() → enlever_accents (NFD + encode ASCII) → re.sub
+- preparer_texte : NFKD → suppression des accents sur les octets → table d'octets → décodage ASCII
+- preparer_fichier : même normalisation, par blocs depuis un fichier
+
+Affiche la durée (meilleure de plusieurs répétitions), le débit et le pic mémoire (tracemalloc).
+
+Utilisation : python benchmarks/bench_normalisation.py [--tailles-mo 1 10 50]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from normalisation import enlever_accents, preparer_texte, preparer_fichier
+
+def ancienne_chaine(texte):
+    """Normalisation telle que faite auparavant dans nettoyer_texte"""
+    return re.sub(r"[^a-z\s]", " ", enlever_accents(texte.lower()))
+
+def mesurer(fonction, repetitions):
+    """Meilleure durée sur plusieurs répétitions, puis pic mémoire sur une exécution à part
+    (tracemalloc ralentit les appels Python et fausserait les durées)"""
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+
+    tracemalloc.start()
+    fonction()
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(durees), pic / 1024 / 1024
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tailles-mo", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--texte", default=os.path.join(RACINE, "mon_texte.txt"))
+    args = parser.parse_args()
+
+    with open(args.texte, 'r', encoding='utf-8') as f:
+        base = f.read()
+
+    print(f"{'Taille (Mo)':>11} {'Méthode':<18} {'Durée (s)':>10} {'Débit (Mo/s)':>13} {'Pic mémoire (Mo)':>17}")
+    for taille in args.tailles_mo:
+        texte = base * max(1, taille * 1024 * 1024 // len(base.encode("utf-8")))
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix=".txt", delete=False) as f:
+            f.write(texte)
+            chemin = f.name
+
+        methodes = {
+            "ancienne chaîne": lambda: ancienne_chaine(texte),
+            "preparer_texte": lambda: preparer_texte(texte),
+            "preparer_fichier": lambda: sum(len(bloc) for bloc in preparer_fichier(chemin)),
+        }
+        try:
+            for nom, fonction in methodes.items():
+                duree, pic = mesurer(fonction, args.repetitions)
+                print(f"{taille:>11} {nom:<18} {duree:>10.3f} {taille / duree:>13.1f} {pic:>17.1f}")
+        finally:
+            os.remove(chemin)
@@ -0,0 +1,70 @@
+"""
+Générateur de corpus français synthétique pour les benchmarks
+
+Les phrases suivent quelques gabarits (sujet, verbe, complément) remplis avec un
+vocabulaire français courant, les mots-clés des thèmes (themes.json) et des noms propres,
+pour que chaque étape (NER, thèmes, TF-IDF, résumé) ait de quoi travailler.
+
+Utilisation : python benchmarks/corpus_synthetique.py 1000 --longueur longue --sortie corpus.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from themes import THEMES
+
+# Nombre de phrases par document selon la longueur demandée
+LONGUEURS = {"courte": (1, 3), "moyenne": (5, 15), "longue": (40, 120)}
+
+PERSONNES = ["Emmanuel Macron", "Marie Curie", "Zinédine Zidane", "Simone Veil", "Victor Hugo", "Thomas Pesquet"]
+LIEUX = ["Paris", "Lyon", "Marseille", "Amiens", "Bordeaux", "la Bretagne", "l'Europe"]
+ORGANISATIONS = ["l'Assemblée nationale", "le CNRS", "l'OMS", "la Banque de France", "l'Olympique de Marseille"]
+NOMS = ["projet", "réforme", "étude", "équipe", "décision", "rapport", "débat", "économie", "société", "avenir",
+        "campagne", "crise", "population", "gestion", "stratégie", "résultat", "saison", "recherche"]
+ADJECTIFS = ["important", "nouvelle", "rapide", "public", "national", "difficile", "récent", "ambitieux", "fragile"]
+VERBES = ["présente", "annonce", "critique", "soutient", "prépare", "analyse", "défend", "lance", "améliore"]
+LIAISONS = ["Selon", "Après", "Malgré", "Pendant", "Depuis"]
+
+GABARITS = [
+    "{personne} {verbe} un {nom} {adjectif} sur {mot_cle} à {lieu}.",
+    "{liaison} le {nom} {adjectif}, {organisation} {verbe} une {nom2} autour de {mot_cle}.",
+    "À {lieu}, {personne} et {organisation} {verbe} le {nom} de {mot_cle} et de {mot_cle2}.",
+    "Le {nom} sur {mot_cle} reste {adjectif} pour {organisation}, {verbe} {personne}.",
+]
+
+def generer_document(rng, nb_phrases, theme=None):
+    """Un document de nb_phrases phrases, centré sur un thème tiré au hasard"""
+    theme = theme or rng.choice(list(THEMES))
+    mots_cles = THEMES[theme]
+    phrases = []
+    for _ in range(nb_phrases):
+        phrases.append(rng.choice(GABARITS).format(
+            personne=rng.choice(PERSONNES), lieu=rng.choice(LIEUX), organisation=rng.choice(ORGANISATIONS),
+            nom=rng.choice(NOMS), nom2=rng.choice(NOMS), adjectif=rng.choice(ADJECTIFS),
+            verbe=rng.choice(VERBES), liaison=rng.choice(LIAISONS),
+            mot_cle=rng.choice(mots_cles), mot_cle2=rng.choice(mots_cles),
+        ))
+    return " ".join(phrases)
+
+def generer_corpus(nb_documents, longueur="moyenne", graine=42):
+    """Liste de nb_documents textes ; longueur : clé de LONGUEURS ou couple (min, max) de phrases"""
+    rng = random.Random(graine)
+    minimum, maximum = LONGUEURS[longueur] if isinstance(longueur, str) else longueur
+    return [generer_document(rng, rng.randint(minimum, maximum)) for _ in range(nb_documents)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("nb_documents", type=int)
+    parser.add_argument("--longueur", choices=LONGUEURS, default="moyenne")
+    parser.add_argument("--graine", type=int, default=42)
+    parser.add_argument("--sortie", required=True, help="Fichier .jsonl ({\"id\", \"texte\"} par ligne)")
+    args = parser.parse_args()
+
+    with open(args.sortie, 'w', encoding='utf-8') as f:
+        for i, texte in enumerate(generer_corpus(args.nb_documents, args.longueur, args.graine)):
+            f.write(json.dumps({"id": i, "texte": texte}, ensure_ascii=False) + "\n")
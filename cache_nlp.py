@@ -0,0 +1,202 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+import spacy
+from spacy.tokens import Doc
+
+from modele_nlp import NOM_MODELE, PROFILS, charger_composants, charger_modele
+
+# Cache disque des analyses spaCy, indexé par empreinte du texte + modèle (une entrée par texte).
+# Un texte déjà analysé (même lors d'une exécution précédente) n'est pas re-parsé.
+# Chaque entrée garde les composants avec lesquels le texte a été analysé : un profil dont les
+# composants y sont inclus réutilise l'analyse ; sinon le texte est ré-analysé avec l'union des
+# composants (ex : "lemmes" puis "ner" → analyse avec les deux) et l'entrée est remplacée.
+# Les Doc sont stockés sérialisés (sans les tenseurs) dans une base SQLite ;
+# au-delà de taille_max octets, les entrées les moins récemment utilisées sont supprimées
+# jusqu'à redescendre à taille_basse × taille_max : les évictions suivantes sont espacées.
+# La base est en mode WAL : plusieurs processus (n_process, service) lisent pendant qu'un autre
+# écrit, et un écrivain attend au plus attente_verrou secondes que le verrou se libère.
+CONFIG = {
+    "actif": True,
+    "chemin": os.environ.get(
+        "CACHE_NLP", os.path.join(os.path.expanduser("~"), ".cache", "tp_python_llm", "analyses.sqlite")
+    ),
+    "taille_max": 512 * 1024 * 1024,
+    "taille_basse": 0.9,
+    "attente_verrou": 30.0,
+}
+
+# Compteurs du processus courant
+STATS = {"hits": 0, "misses": 0}
+
+_connexion = None
+# Taille totale stockée, tenue à jour à chaque écriture pour ne lancer l'éviction qu'au besoin
+_taille = 0
+
+def configurer_cache(actif=None, chemin=None, taille_max=None):
+    """Modifier la configuration du cache (None = inchangé)"""
+    global _connexion
+    if actif is not None:
+        CONFIG["actif"] = actif
+    if chemin is not None:
+        CONFIG["chemin"] = chemin
+    if taille_max is not None:
+        CONFIG["taille_max"] = taille_max
+    if _connexion is not None:
+        _connexion.close()
+        _connexion = None
+
+def _base():
+    """Connexion SQLite ouverte au premier usage"""
+    global _connexion, _taille
+    if _connexion is None:
+        os.makedirs(os.path.dirname(os.path.abspath(CONFIG["chemin"])), exist_ok=True)
+        _connexion = sqlite3.connect(CONFIG["chemin"], timeout=CONFIG["attente_verrou"])
+        _connexion.execute("PRAGMA journal_mode=WAL")
+        # Ancien format (une entrée par profil, sans composants) : les clés ont changé, on repart de zéro
+        colonnes = [ligne[1] for ligne in _connexion.execute("PRAGMA table_info(analyses)")]
+        if colonnes and "composants" not in colonnes:
+            with _connexion:
+                _connexion.execute("DROP TABLE analyses")
+        _connexion.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "cle TEXT PRIMARY KEY, donnees BLOB, taille INTEGER, dernier_acces REAL, composants TEXT)"
+        )
+        _connexion.execute("CREATE INDEX IF NOT EXISTS idx_acces ON analyses (dernier_acces)")
+        _taille = _taille_stockee()
+    return _connexion
+
+def _taille_stockee():
+    return _connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM analyses").fetchone()[0]
+
+def cle_cache(texte, nlp):
+    """Empreinte du texte et du modèle (nom, version), commune à tous les profils"""
+    empreinte = hashlib.blake2b(digest_size=20)
+    for partie in (NOM_MODELE, nlp.meta.get("version", ""), spacy.__version__, texte):
+        empreinte.update(partie.encode("utf-8"))
+        empreinte.update(b"\0")
+    return empreinte.hexdigest()
+
+def _lire(cles, composants, nlp):
+    """
+    Doc en cache pour chaque clé, None si absent ou analysé sans tous les `composants`
+    Une requête par tranche de clés et une seule transaction pour la date d'accès de tout le lot.
+    Renvoie (docs, composants déjà stockés pour chaque clé : frozenset vide si absente).
+    """
+    lignes = {}
+    for debut in range(0, len(cles), 500):
+        tranche = cles[debut:debut + 500]
+        for cle, donnees, stockes in _base().execute(
+            f"SELECT cle, donnees, composants FROM analyses WHERE cle IN ({','.join('?' * len(tranche))})", tranche,
+        ):
+            lignes[cle] = (donnees, frozenset(stockes.split(",")))
+    utilisables = {cle for cle, (_, stockes) in lignes.items() if composants <= stockes}
+    if utilisables:
+        maintenant = time.time()
+        with _base() as base:
+            base.executemany("UPDATE analyses SET dernier_acces = ? WHERE cle = ?", ((maintenant, cle) for cle in utilisables))
+    docs = [Doc(nlp.vocab).from_bytes(lignes[cle][0]) if cle in utilisables else None for cle in cles]
+    return docs, [lignes[cle][1] if cle in lignes else frozenset() for cle in cles]
+
+def _enregistrer(elements):
+    """
+    Stocker des (cle, doc, composants) ; les entrées les plus anciennes ne sont supprimées que lorsque
+    la taille tenue à jour dépasse taille_max, et jusqu'à taille_basse × taille_max
+    """
+    global _taille
+    maintenant = time.time()
+    lignes = []
+    for cle, doc, composants in elements:
+        donnees = doc.to_bytes(exclude=["tensor", "user_data"])
+        lignes.append((cle, donnees, len(donnees), maintenant, ",".join(sorted(composants))))
+    with _base() as base:
+        base.executemany("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)", lignes)
+        _taille += sum(ligne[2] for ligne in lignes)
+        if _taille <= CONFIG["taille_max"]:
+            return
+        # Recompté sur la base : entrées remplacées ou écrites par d'autres processus.
+        # Marge sous taille_max : le parcours complet de la table n'a pas lieu à chaque écriture.
+        base.execute(
+            "DELETE FROM analyses WHERE cle IN ("
+            "SELECT cle FROM (SELECT cle, SUM(taille) OVER (ORDER BY dernier_acces DESC, cle) AS cumul "
+            "FROM analyses) WHERE cumul > ?)",
+            (CONFIG["taille_max"] * CONFIG["taille_basse"],),
+        )
+        _taille = _taille_stockee()
+
+def analyser(texte, profil="complet"):
+    """
+    Équivalent de charger_modele(profil)(texte), en passant par le cache
+    Le Doc renvoyé peut porter plus d'annotations que le profil (analyse déjà faite par un
+    profil plus large).
+    """
+    nlp = charger_modele(profil)
+    if not CONFIG["actif"]:
+        return nlp(texte)
+
+    composants = frozenset(PROFILS[profil])
+    cle = cle_cache(texte, nlp)
+    docs, stockes = _lire([cle], composants, nlp)
+    if docs[0] is not None:
+        STATS["hits"] += 1
+        return docs[0]
+
+    STATS["misses"] += 1
+    composants |= stockes[0]
+    doc = charger_composants(composants)(texte)
+    _enregistrer([(cle, doc, composants)])
+    return doc
+
+def analyser_lot(textes, profil="complet", batch_size=1000, n_process=1):
+    """
+    Équivalent de charger_modele(profil).pipe(textes), en passant par le cache
+    Seuls les textes absents du cache sont envoyés à nlp.pipe ; l'ordre est conservé.
+    """
+    nlp = charger_modele(profil)
+    if not CONFIG["actif"]:
+        yield from nlp.pipe(textes, batch_size=batch_size, n_process=n_process)
+        return
+
+    lot = []
+    for texte in textes:
+        lot.append(texte)
+        if len(lot) == batch_size:
+            yield from _analyser_lot(lot, profil, nlp, batch_size, n_process)
+            lot = []
+    if lot:
+        yield from _analyser_lot(lot, profil, nlp, batch_size, n_process)
+
+def _analyser_lot(textes, profil, nlp, batch_size, n_process):
+    composants = frozenset(PROFILS[profil])
+    cles = [cle_cache(texte, nlp) for texte in textes]
+    docs, stockes = _lire(cles, composants, nlp)
+    manquants = [i for i, doc in enumerate(docs) if doc is None]
+    STATS["hits"] += len(textes) - len(manquants)
+    STATS["misses"] += len(manquants)
+
+    # Un texte déjà analysé par un autre profil est ré-analysé avec l'union des composants
+    groupes = {}
+    for i in manquants:
+        groupes.setdefault(composants | stockes[i], []).append(i)
+    for composants_groupe, positions in groupes.items():
+        nouveaux = charger_composants(composants_groupe).pipe(
+            (textes[i] for i in positions), batch_size=batch_size, n_process=n_process,
+        )
+        for i, doc in zip(positions, nouveaux):
+            docs[i] = doc
+        _enregistrer((cles[i], docs[i], composants_groupe) for i in positions)
+    return docs
+
+def stats_cache():
+    """Compteurs hits / misses du processus et occupation du cache sur disque"""
+    nb_entrees, taille = _base().execute("SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM analyses").fetchone()
+    return {**STATS, "entrees": nb_entrees, "taille_octets": taille}
+
+def vider_cache_analyses():
+    """Supprimer toutes les analyses stockées"""
+    global _taille
+    with _base() as base:
+        base.execute("DELETE FROM analyses")
+    _taille = 0
@@ -1,35 +1,22 @@
-import spacy
 from collections import Counter
+from cache_nlp import analyser
+from themes import THEMES, SEUIL_SIMILARITE, scorer_mots, theme_dominant, classer_corpus
+from mesures import chronometrer
 
-# Étape 4.1 : Thèmes prédéfinis avec mots-clés
-THEMES = {
-    "science": ["recherche", "univers", "physique", "biologie", "experience", "atome", "adn", "intelligence", "algorithme"],
-    "politique": ["gouvernement", "president", "ministre", "loi", "parlement", "république", "parti", "vote"],
-    "sport": ["match", "joueur", "football", "score", "olympique", "tennis", "stade", "but", "compétition"],
-    "économie": ["marché", "bourse", "argent", "finance", "banque", "PIB", "inflation", "chômage", "entreprise"],
-    "technologie": ["intelligence", "artificielle", "algorithme", "ordinateur", "réseau", "digital", "robot", "code"],
-    "santé": ["virus", "vaccin", "hopital", "maladie", "symptôme", "soin", "traitement", "pandémie"],
-}
+# Étape 4.1 : Thèmes prédéfinis avec mots-clés (définis dans themes.json)
 
-# Charger le modèle spaCy français
-nlp = spacy.load("fr_core_news_sm")
+# Similarité cosinus minimale au centroïde d'un thème pour la classification par lots
+SEUIL_CENTROIDES = SEUIL_SIMILARITE
 
+@chronometrer("detecter_theme_par_motcles")
 def detecter_theme_par_motcles(mots):
-    """Étape 4.2 : Classifieur simple basé sur mots-clés"""
-    scores = {theme: 0 for theme in THEMES}
-    for mot in mots:
-        for theme, keywords in THEMES.items():
-            if mot in keywords:
-                scores[theme] += 1
-
-    theme_dominant = max(scores, key=scores.get)
-    if scores[theme_dominant] == 0:
-        return "Inconnu"
-    return theme_dominant
+    """Étape 4.2 : Classifieur simple basé sur mots-clés (index inversé, une passe)"""
+    return theme_dominant(scorer_mots(mots))
 
+@chronometrer("detecter_theme_par_modele")
 def detecter_theme_par_modele(texte):
     """Étape 4.3 : Classification NLP simple avec spaCy"""
-    doc = nlp(texte)
+    doc = analyser(texte, "lemmes")
     # On extrait les mots les plus fréquents dans le texte
     mots = [token.lemma_ for token in doc if not token.is_stop and token.is_alpha]
     compteur = Counter(mots)
@@ -38,6 +25,17 @@ def detecter_theme_par_modele(texte):
         print(f"{mot} : {freq}")
     return detecter_theme_par_motcles(mots)
 
+@chronometrer("classer_textes")
+def classer_textes(textes_liste_mots, k=3, seuil=SEUIL_CENTROIDES, graines=None, lemmatiser=False):
+    """
+    Étape 4.4 : Classification par lots de tout un corpus, par similarité aux centroïdes des thèmes
+    Mots-clés normalisés comme le texte nettoyé ("economie" retrouve "économie"), un seul
+    produit matriciel documents × thèmes ; renvoie les k meilleurs (theme, similarité) par texte.
+    - graines : {theme: [liste de mots, ...]} documents d'exemple enrichissant les centroïdes
+    - lemmatiser : lemmatiser aussi les mots-clés avec spaCy (voir themes.mots_cles_normalises)
+    """
+    return classer_corpus(textes_liste_mots, k=k, seuil=seuil, graines=graines, lemmatiser=lemmatiser)
+
 def classer_texte(liste_mots):
     """Classe un texte selon les mots et NLP"""
     print("\n🧠 Classification par mots-clés :")
@@ -1,28 +1,13 @@
-import spacy
 import os
-import unicodedata
-import re
-
-# Chargement du modèle spaCy français
-try:
-    nlp = spacy.load("fr_core_news_sm")
-except:
-    print("Erreur : le modèle spaCy 'fr_core_news_sm' n'est pas installé.")
-    exit()
-
-# Liste personnalisée de mots à supprimer
-mots_a_supprimer = {
-    "le", "la", "les", "un", "une", "des", "de", "du", "au", "aux", "en",
-    "l", "d", "ce", "ces", "cet", "cette", "mon", "ton", "son", "ma", "ta",
-    "sa", "mes", "tes", "ses", "nos", "vos", "leurs"
-}
-
-def enlever_accents(texte):
-    """Remplacer les caractères accentués par leurs équivalents sans accent"""
-    texte = unicodedata.normalize('NFD', texte)
-    texte = texte.encode('ascii', 'ignore').decode('utf-8')
-    return texte
+import json
+import time
+import argparse
+from cache_nlp import analyser, analyser_lot
+from normalisation import mots_a_supprimer, enlever_accents, preparer_texte, filtrer_tokens
+from mesures import chronometrer
+from corpus_ids import ecrire_corpus
 
+@chronometrer("charger_fichier")
 def charger_fichier(chemin):
     """Étape 2.1 : Charger un fichier texte et afficher les premières lignes"""
     if not os.path.exists(chemin):
@@ -42,41 +27,110 @@ def charger_fichier(chemin):
         print(f"Erreur inconnue : {e}")
         return None
 
+@chronometrer("nettoyer_texte")
 def nettoyer_texte(texte):
     """Étape 2.2 : Nettoyage et préparation du texte"""
     print("\n🔍 Texte original (extrait) :")
     print(texte[:300], "...\n")
 
-    # 1. Mise en minuscules
-    texte = texte.lower()
-
-    # 2. Remplacement des caractères accentués
-    texte = enlever_accents(texte)
+    texte = preparer_texte(texte)
 
-    # 3. Suppression de tout sauf lettres et espaces
-    texte = re.sub(r"[^a-z\s]", " ", texte)
-
-    # 4. Tokenisation
-    doc = nlp(texte)
-
-    tokens_nettoyes = []
-    for token in doc:
-        if (
-            not token.is_stop
-            and token.text not in mots_a_supprimer
-            and not token.is_punct
-            and not token.is_space
-        ):
-            tokens_nettoyes.append(token.lemma_)
+    # 4. Tokenisation (tokenizer + lemmatiseur uniquement, via le cache d'analyses)
+    doc = analyser(texte, "lemmes")
+    tokens_nettoyes = filtrer_tokens(doc)
 
     print("✅ Liste finale des mots nettoyés :")
     print(tokens_nettoyes)
     return tokens_nettoyes
 
+def lire_corpus(chemin, champ="texte"):
+    """
+    Lire un corpus document par document sans le charger entièrement
+    - fichier .jsonl : un objet JSON par ligne, le texte est dans `champ`
+    - autre fichier : un document par ligne non vide
+    """
+    est_jsonl = chemin.endswith(".jsonl")
+    with open(chemin, 'r', encoding='utf-8') as f:
+        for numero, ligne in enumerate(f, start=1):
+            ligne = ligne.strip()
+            if not ligne:
+                continue
+            if not est_jsonl:
+                yield ligne
+                continue
+            try:
+                yield json.loads(ligne)[champ]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                print(f"Erreur : ligne {numero} ignorée (JSON invalide ou champ '{champ}' absent).")
+
+def nettoyer_corpus(textes, batch_size=1000, n_process=1, stats=None):
+    """
+    Nettoyage d'un corpus en flux avec nlp.pipe
+    - textes : itérable de textes bruts (ex : lire_corpus(chemin))
+    - stats : dictionnaire optionnel rempli au fil de l'eau (documents, tokens, durée)
+    Renvoie un générateur de listes de mots nettoyés, un document à la fois.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(documents=0, tokens=0, duree=0.0)
+
+    textes_prepares = (preparer_texte(texte) for texte in textes)
+    docs = analyser_lot(textes_prepares, "lemmes", batch_size=batch_size, n_process=n_process)
+
+    # On ne compte que le temps passé dans le nettoyage, pas chez l'appelant
+    debut = time.perf_counter()
+    for doc in docs:
+        tokens_nettoyes = filtrer_tokens(doc)
+        stats["documents"] += 1
+        stats["tokens"] += len(tokens_nettoyes)
+        stats["duree"] += time.perf_counter() - debut
+        yield tokens_nettoyes
+        debut = time.perf_counter()
+
+def rapport_debit(stats):
+    """Afficher le débit du nettoyage en documents/s et tokens/s"""
+    duree = stats["duree"] or float("inf")
+    docs_par_sec = stats["documents"] / duree
+    tokens_par_sec = stats["tokens"] / duree
+
+    print("\n⏱️ Débit du nettoyage :")
+    print(f"Documents : {stats['documents']} ({docs_par_sec:.1f} docs/s)")
+    print(f"Tokens    : {stats['tokens']} ({tokens_par_sec:.1f} tokens/s)")
+    print(f"Durée     : {stats['duree']:.2f} s")
+    return docs_par_sec, tokens_par_sec
+
 # 🔧 Exemple d'utilisation
 if __name__ == "__main__":
-    chemin_fichier = "mon_texte.txt"  # Remplace ce chemin par ton fichier réel
-    texte = charger_fichier(chemin_fichier)
-    
-    if texte:
-        nettoyer_texte(texte)
+    parser = argparse.ArgumentParser(description="Nettoyage d'un texte ou d'un corpus")
+    parser.add_argument("corpus", nargs="?", help="Corpus .txt (un document par ligne) ou .jsonl")
+    parser.add_argument("--champ", default="texte", help="Champ contenant le texte dans un .jsonl")
+    parser.add_argument("--sortie", help="Fichier .jsonl où écrire les listes de mots nettoyés")
+    parser.add_argument("--sortie-ids", help="Dossier où écrire le corpus compact d'identifiants (voir corpus_ids.py)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.corpus:
+        stats = {}
+        documents = nettoyer_corpus(
+            lire_corpus(args.corpus, args.champ),
+            batch_size=args.batch_size,
+            n_process=args.n_process,
+            stats=stats,
+        )
+        if args.sortie_ids:
+            ecrire_corpus(args.sortie_ids, documents)
+        elif args.sortie:
+            with open(args.sortie, 'w', encoding='utf-8') as f:
+                for tokens_nettoyes in documents:
+                    f.write(json.dumps(tokens_nettoyes, ensure_ascii=False) + "\n")
+        else:
+            for _ in documents:
+                pass
+        rapport_debit(stats)
+    else:
+        chemin_fichier = "mon_texte.txt"  # Remplace ce chemin par ton fichier réel
+        texte = charger_fichier(chemin_fichier)
+
+        if texte:
+            nettoyer_texte(texte)
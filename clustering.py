@@ -0,0 +1,116 @@
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.metrics import silhouette_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import Normalizer
+
+from tfidf import transformer_tfidf
+
+# Méthodes de clustering disponibles
+# - kmeans : KMeans classique sur toute la matrice en mémoire
+# - minibatch : MiniBatchKMeans, adapté aux gros corpus et au mode par lots
+METHODES = ("kmeans", "minibatch")
+
+def creer_reduction(X, n_composantes, random_state=42):
+    """Réduction de dimension (TruncatedSVD + normalisation L2) ajustée sur X"""
+    # TruncatedSVD : au plus min(documents, features) - 1 composantes
+    n_composantes = max(1, min(n_composantes, X.shape[0] - 1, X.shape[1] - 1))
+    reduction = make_pipeline(
+        TruncatedSVD(n_components=n_composantes, random_state=random_state),
+        Normalizer(copy=False),
+    )
+    reduction.fit(X)
+    return reduction
+
+def choisir_k(X, k_max=10, taille_echantillon=2000, random_state=42):
+    """Choisir le nombre de clusters par score de silhouette sur un échantillon de X"""
+    n = X.shape[0]
+    if n < 3:
+        return n
+
+    rng = np.random.default_rng(random_state)
+    if n > taille_echantillon:
+        X = X[rng.choice(n, taille_echantillon, replace=False)]
+        n = taille_echantillon
+
+    meilleur_k, meilleur_score = 2, -1.0
+    for k in range(2, min(k_max, n - 1) + 1):
+        labels = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=3).fit_predict(X)
+        if len(set(labels)) < 2:
+            continue
+        score = silhouette_score(X, labels)
+        if score > meilleur_score:
+            meilleur_k, meilleur_score = k, score
+    return meilleur_k
+
+def creer_modele_clusters(methode, n_clusters, taille_lot=1024, random_state=42):
+    """Instancier l'algorithme de clustering demandé"""
+    if methode == "kmeans":
+        return KMeans(n_clusters=n_clusters, random_state=random_state)
+    if methode == "minibatch":
+        return MiniBatchKMeans(n_clusters=n_clusters, batch_size=taille_lot, random_state=random_state, n_init=3)
+    raise ValueError(f"Méthode de clustering inconnue : '{methode}' (attendu : {', '.join(METHODES)}).")
+
+def clusteriser_matrice(X, methode="kmeans", n_clusters=2, n_composantes=None, random_state=42):
+    """
+    Clustering d'une matrice en mémoire (documents × features)
+    - n_clusters : nombre de clusters, ou "auto" pour le choisir par silhouette
+    - n_composantes : si renseigné, réduction TruncatedSVD avant le clustering
+    Renvoie le tableau des labels.
+    """
+    n = X.shape[0]
+    if n_composantes and min(X.shape) > 2:
+        X = creer_reduction(X, n_composantes, random_state).transform(X)
+    if n_clusters == "auto":
+        n_clusters = choisir_k(X, random_state=random_state)
+
+    # Pas assez de textes pour autant de clusters : on en fait au plus un par texte
+    n_clusters = min(n_clusters, n)
+    if n_clusters <= 1:
+        return np.zeros(n, dtype=np.int32)
+
+    return creer_modele_clusters(methode, n_clusters, random_state=random_state).fit_predict(X)
+
+def clusteriser_flux(lots, modele_tfidf, n_clusters="auto", n_composantes=None, random_state=42):
+    """
+    Clustering hors mémoire avec MiniBatchKMeans.partial_fit
+    - lots : fonction sans argument renvoyant un itérable de lots (listes de listes de mots) ;
+      elle est appelée deux fois (apprentissage puis affectation des labels)
+    - modele_tfidf : modèle TF-IDF déjà ajusté (voir tfidf.py)
+    La réduction de dimension et le choix de k se font sur le premier lot non vide.
+    Renvoie le tableau des labels, dans l'ordre des documents.
+    """
+    reduction, clusters = None, None
+    for lot in lots():
+        # Un lot vide n'apprend rien et ne doit pas fixer la réduction ni k
+        if not len(lot):
+            continue
+        X = transformer_tfidf(modele_tfidf, lot)
+        if clusters is None:
+            if n_composantes and min(X.shape) > 2:
+                reduction = creer_reduction(X, n_composantes, random_state)
+            if reduction is not None:
+                X = reduction.transform(X)
+            k = choisir_k(X, random_state=random_state) if n_clusters == "auto" else n_clusters
+            # partial_fit exige au moins k documents dans le premier lot
+            if k > X.shape[0]:
+                print(f"⚠️ Premier lot de {X.shape[0]} document(s) : {X.shape[0]} cluster(s) au lieu de {k}.")
+            k = max(1, min(k, X.shape[0]))
+            clusters = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=3)
+        elif reduction is not None:
+            X = reduction.transform(X)
+        clusters.partial_fit(X)
+
+    if clusters is None:
+        return np.zeros(0, dtype=np.int32)
+
+    labels = []
+    for lot in lots():
+        if not len(lot):
+            continue
+        X = transformer_tfidf(modele_tfidf, lot)
+        if reduction is not None:
+            X = reduction.transform(X)
+        labels.append(clusters.predict(X))
+    return np.concatenate(labels) if labels else np.zeros(0, dtype=np.int32)
@@ -0,0 +1,144 @@
+import json
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+from tfidf import calculer_idf, ponderer_tfidf
+
+# Corpus compact : vocabulaire partagé et identifiants de mots (int32) mappés en mémoire.
+# Évite de garder des listes de chaînes Python (~50 octets par mot) et de re-tokeniser.
+# Sur disque, un dossier contenant :
+# - vocabulaire.json : liste des mots (l'identifiant d'un mot est sa position)
+# - tokens.i32 : identifiants de tous les documents, mis bout à bout
+# - offsets.i64 : début de chaque document dans tokens (nb_documents + 1 valeurs)
+# Un corpus ouvert est un dictionnaire :
+# - vocabulaire : liste des mots
+# - index : {mot: identifiant}
+# - tokens : identifiants (np.memmap en lecture seule)
+# - offsets : bornes des documents dans tokens
+
+def ecrire_corpus(dossier, textes_liste_mots, vocabulaire=None):
+    """
+    Écrire un corpus en flux, un document à la fois (ex : sortie de nettoyer_corpus)
+    - vocabulaire : liste de mots initiale, pour garder les identifiants d'un corpus existant
+    Renvoie le nombre de documents écrits.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    mots = list(vocabulaire or [])
+    index = {mot: i for i, mot in enumerate(mots)}
+    offsets = [0]
+    with open(os.path.join(dossier, "tokens.i32"), 'wb') as f:
+        for liste_mots in textes_liste_mots:
+            ids = np.fromiter(
+                (index.setdefault(mot, len(index)) for mot in liste_mots),
+                dtype=np.int32, count=len(liste_mots),
+            )
+            ids.tofile(f)
+            offsets.append(offsets[-1] + len(ids))
+
+    # Mots ajoutés pendant l'écriture, dans l'ordre de leurs identifiants
+    mots.extend(list(index)[len(mots):])
+    np.asarray(offsets, dtype=np.int64).tofile(os.path.join(dossier, "offsets.i64"))
+    with open(os.path.join(dossier, "vocabulaire.json"), 'w', encoding='utf-8') as f:
+        json.dump(mots, f, ensure_ascii=False)
+    return len(offsets) - 1
+
+def _mapper(chemin, dtype):
+    """Tableau mappé en lecture seule (np.memmap refuse les fichiers vides)"""
+    if os.path.getsize(chemin) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(chemin, dtype=dtype, mode="r")
+
+def ouvrir_corpus(dossier):
+    """Ouvrir un corpus écrit par ecrire_corpus : seuls le vocabulaire et les bornes sont lus"""
+    with open(os.path.join(dossier, "vocabulaire.json"), 'r', encoding='utf-8') as f:
+        vocabulaire = json.load(f)
+    return {
+        "vocabulaire": vocabulaire,
+        "index": {mot: i for i, mot in enumerate(vocabulaire)},
+        "tokens": _mapper(os.path.join(dossier, "tokens.i32"), np.int32),
+        "offsets": np.fromfile(os.path.join(dossier, "offsets.i64"), dtype=np.int64),
+    }
+
+def nb_documents(corpus):
+    return len(corpus["offsets"]) - 1
+
+def document(corpus, i):
+    """Identifiants du document i : vue sur le fichier mappé, sans copie"""
+    offsets = corpus["offsets"]
+    return corpus["tokens"][offsets[i]:offsets[i + 1]]
+
+def mots_document(corpus, i):
+    """Liste de mots du document i (pour les étapes qui attendent encore des chaînes)"""
+    vocabulaire = corpus["vocabulaire"]
+    return [vocabulaire[id_mot] for id_mot in document(corpus, i)]
+
+def encoder_mots(corpus, mots):
+    """Identifiants d'une liste de mots ; les mots absents du vocabulaire sont ignorés"""
+    index = corpus["index"]
+    return np.fromiter((index[mot] for mot in mots if mot in index), dtype=np.int32)
+
+def frequences_ids(ids, taille_vocabulaire):
+    """Nombre d'occurrences de chaque identifiant (np.bincount plutôt que Counter)"""
+    return np.bincount(ids, minlength=taille_vocabulaire)
+
+def matrice_comptes(corpus, taille_lot=10000):
+    """
+    Matrice creuse documents × vocabulaire des fréquences brutes
+    Construite directement à partir des tableaux du corpus (tokens = indices, offsets = indptr),
+    par lots de taille_lot documents : seuls les identifiants d'un lot sont copiés en mémoire
+    (le tri des indices ne peut pas se faire sur le fichier mappé en lecture seule).
+    """
+    offsets = np.asarray(corpus["offsets"])
+    lots = []
+    for debut in range(0, nb_documents(corpus), taille_lot):
+        bornes = offsets[debut:debut + taille_lot + 1]
+        tokens = np.array(corpus["tokens"][bornes[0]:bornes[-1]], dtype=np.int32)
+        lot = csr_matrix(
+            (np.ones(len(tokens), dtype=np.float64), tokens, bornes - bornes[0]),
+            shape=(len(bornes) - 1, len(corpus["vocabulaire"])),
+        )
+        # Les doublons d'un même document sont additionnés
+        lot.sum_duplicates()
+        lots.append(lot)
+    if not lots:
+        return csr_matrix((0, len(corpus["vocabulaire"])), dtype=np.float64)
+    return vstack(lots, format="csr")
+
+def modele_tfidf_corpus(corpus, comptes=None):
+    """Modèle TF-IDF (format de tfidf.py) dont les colonnes sont les identifiants du corpus"""
+    if comptes is None:
+        comptes = matrice_comptes(corpus)
+    df = np.bincount(comptes.indices, minlength=len(corpus["vocabulaire"]))
+    return {
+        "vocabulaire": dict(corpus["index"]),
+        "df": df,
+        "nb_documents": nb_documents(corpus),
+        "idf": calculer_idf(df, nb_documents(corpus)),
+    }
+
+def tfidf_corpus(corpus, modele=None):
+    """
+    Matrice TF-IDF documents × vocabulaire du modèle
+    - modele : modèle TF-IDF déjà ajusté (tfidf.py), sinon ajusté sur le corpus
+    Renvoie (matrice, modele).
+    """
+    comptes = matrice_comptes(corpus)
+    if modele is None:
+        modele = modele_tfidf_corpus(corpus, comptes)
+        return ponderer_tfidf(comptes, modele["idf"]), modele
+
+    # Identifiant du corpus → colonne du modèle (-1 : mot inconnu du modèle, ignoré)
+    vocabulaire_modele = modele["vocabulaire"]
+    colonnes = np.fromiter(
+        (vocabulaire_modele.get(mot, -1) for mot in corpus["vocabulaire"]),
+        dtype=np.int64, count=len(corpus["vocabulaire"]),
+    )
+    coo = comptes.tocoo()
+    connus = colonnes[coo.col] >= 0
+    comptes_modele = csr_matrix(
+        (coo.data[connus], (coo.row[connus], colonnes[coo.col[connus]])),
+        shape=(comptes.shape[0], len(vocabulaire_modele)),
+    )
+    return ponderer_tfidf(comptes_modele, modele["idf"]), modele
@@ -1,49 +1,36 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
 from collections import Counter
-import spacy
 import numpy as np
+from themes import THEMES, SEUIL_SIMILARITE, classer_corpus
+from tfidf import ajuster_tfidf, transformer_tfidf
+from clustering import clusteriser_matrice
+from mesures import chronometrer
+from doublons import dedoublonner, rapport_doublons, afficher_rapport_doublons
 
-# Chargement du modèle spaCy
-nlp = spacy.load("fr_core_news_sm")
-
-# Seuil de mots-clés associés à un thème connu pour être classé (ex: si < 2 → inconnu)
-SEUIL_SIMILARITE = 2
-
-# Thèmes existants (doivent correspondre à ceux du fichier classification_texte.py)
-THEMES = {
-    "science": ["recherche", "univers", "physique", "biologie", "experience", "atome", "adn"],
-    "politique": ["gouvernement", "president", "ministre", "loi", "parlement", "république"],
-    "sport": ["match", "joueur", "football", "score", "tennis", "stade", "but"],
-    "économie": ["marché", "bourse", "finance", "banque", "argent"],
-    "technologie": ["intelligence", "artificielle", "algorithme", "réseau", "robot", "ordinateur"],
-}
+# Similarité de Jaccard (MinHash) conseillée pour le dédoublonnage de traiter_textes (désactivé par défaut)
+SEUIL_DOUBLONS = 0.8
 
+@chronometrer("detecter_theme")
 def detecter_theme(mots):
     """Détecte si le texte correspond à un thème connu"""
-    scores = {theme: 0 for theme in THEMES}
-    for mot in mots:
-        for theme, keywords in THEMES.items():
-            if mot in keywords:
-                scores[theme] += 1
-    theme_dominant = max(scores, key=scores.get)
-    if scores[theme_dominant] < SEUIL_SIMILARITE:
-        return "Inconnu"
-    return theme_dominant
-
-def transformer_textes(textes_liste_mots):
-    """Transforme les textes (liste de mots) en textes string pour TF-IDF"""
-    return [" ".join(mots) for mots in textes_liste_mots]
-
-def clusteriser_textes(textes_liste_mots, n_clusters=2):
-    """Étape 5.2 : Clustering des textes 'Inconnus' pour regrouper des sujets similaires"""
-    textes = transformer_textes(textes_liste_mots)
-    vectorizer = TfidfVectorizer()
-    X = vectorizer.fit_transform(textes)
-
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-    kmeans.fit(X)
-    labels = kmeans.labels_
+    return classer_corpus([mots], seuil=SEUIL_SIMILARITE)[0][0][0]
+
+@chronometrer("clusteriser_textes")
+def etiqueter_textes(textes_liste_mots, n_clusters=2, modele=None, methode="kmeans", n_composantes=None):
+    """Numéro de cluster de chaque texte, dans l'ordre des textes (paramètres : voir clusteriser_textes)"""
+    if modele is None:
+        modele = ajuster_tfidf(textes_liste_mots)
+    X = transformer_tfidf(modele, textes_liste_mots)
+    return clusteriser_matrice(X, methode=methode, n_clusters=n_clusters, n_composantes=n_composantes)
+
+def clusteriser_textes(textes_liste_mots, n_clusters=2, modele=None, methode="kmeans", n_composantes=None):
+    """
+    Étape 5.2 : Clustering des textes 'Inconnus' pour regrouper des sujets similaires
+    - n_clusters : nombre de clusters, ou "auto" pour le choisir sur un échantillon
+    - modele : modèle TF-IDF déjà ajusté (voir tfidf.py), sinon ajusté sur les textes
+    - methode : "kmeans" ou "minibatch" (voir clustering.py)
+    - n_composantes : réduction TruncatedSVD optionnelle avant le clustering
+    """
+    labels = etiqueter_textes(textes_liste_mots, n_clusters, modele, methode, n_composantes)
 
     clusters = {}
     for i, label in enumerate(labels):
@@ -64,31 +51,61 @@ def generer_nom_theme(cluster):
 
     return "_".join(termes_dominants).capitalize()
 
-def traiter_textes(textes_liste_mots):
+def traiter_textes(textes_liste_mots, n_clusters=2, methode="kmeans", n_composantes=None, seuil_doublons=None):
+    """
+    Pipeline complet : filtrer les inconnus, clusteriser et nommer les nouveaux thèmes
+    - seuil_doublons : si renseigné (ex : SEUIL_DOUBLONS), les quasi-doublons d'un texte déjà vu
+      ne sont ni classés ni clusterisés, ils rejoignent le thème de leur texte canonique
+    """
     if not textes_liste_mots or not isinstance(textes_liste_mots[0], list):
         raise ValueError("Le paramètre doit être une liste de textes, chaque texte étant une liste de mots.")
 
-    """Pipeline complet : filtrer les inconnus, clusteriser et nommer les nouveaux thèmes"""
-    inconnus = []
-    for texte in textes_liste_mots:
-        if detecter_theme(texte) == "Inconnu":
-            inconnus.append(texte)
+    if seuil_doublons is None:
+        canoniques = list(range(len(textes_liste_mots)))
+    else:
+        canoniques = dedoublonner(textes_liste_mots, seuil=seuil_doublons)
+        afficher_rapport_doublons(rapport_doublons(canoniques, textes_liste_mots))
+    positions = [i for i, canonique in enumerate(canoniques) if canonique == i]
+    # Positions des doublons de chaque texte canonique
+    copies = {}
+    for i, canonique in enumerate(canoniques):
+        if canonique != i:
+            copies.setdefault(canonique, []).append(i)
+
+    # Tout le corpus est classé en un seul produit matriciel (voir themes.classer_corpus)
+    uniques = [textes_liste_mots[i] for i in positions]
+    classes = classer_corpus(uniques, seuil=SEUIL_SIMILARITE)
+    inconnus = [i for i, themes in zip(positions, classes) if themes[0][0] == "Inconnu"]
 
     if not inconnus:
         print("✅ Aucun texte inconnu à traiter.")
-        return
+        return {}
 
     print(f"🔎 {len(inconnus)} texte(s) non classés détectés.")
 
-    clusters = clusteriser_textes(inconnus, n_clusters=2)
+    # Clustering des positions inconnues : chaque texte retrouve ses doublons par sa position
+    labels = etiqueter_textes(
+        [textes_liste_mots[i] for i in inconnus], n_clusters=n_clusters, methode=methode, n_composantes=n_composantes
+    )
+    clusters = {}
+    for position, label in zip(inconnus, labels):
+        clusters.setdefault(label, []).append(position)
 
-    for label, cluster in clusters.items():
+    nouveaux_themes = {}
+    for label, positions_cluster in clusters.items():
+        cluster = [textes_liste_mots[i] for i in positions_cluster]
         nom_theme = generer_nom_theme(cluster)
+        membres = nouveaux_themes.setdefault(nom_theme, [])
+        for i in positions_cluster:
+            membres.append(textes_liste_mots[i])
+            membres.extend(textes_liste_mots[j] for j in copies.get(i, []))
         print(f"\n🆕 Nouveau thème détecté : {nom_theme}")
         print("Exemples de textes :")
         for texte in cluster[:2]:
             print(" -", " ".join(texte[:10]), "...")
 
+    return nouveaux_themes
+
 
 if __name__ == "__main__":
     texte_macron = [
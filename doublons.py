@@ -0,0 +1,116 @@
+import hashlib
+
+import numpy as np
+
+# Détection des quasi-doublons (articles repris ou légèrement modifiés) par MinHash + LSH.
+# - MinHash : signature de nb_permutations entiers par document ; la proportion de valeurs
+#   égales entre deux signatures estime la similarité de Jaccard de leurs ensembles de n-grammes.
+# - LSH : la signature est découpée en bandes ; deux documents ne sont comparés que s'ils
+#   partagent au moins une bande identique (recherche sous-linéaire dans le corpus).
+# Un document proche d'un document déjà vu (similarité ≥ seuil) est rattaché à ce document
+# « canonique » et peut réutiliser ses résultats au lieu d'être analysé à nouveau.
+
+# Nombre premier de Mersenne 2^31 - 1 : (a × x + b) reste dans un uint64 pour x < 2^32
+PREMIER = (1 << 31) - 1
+
+def choisir_bandes(nb_permutations, seuil):
+    """
+    Découpage (bandes, lignes) dont le seuil de la courbe LSH, (1 / bandes) ^ (1 / lignes),
+    est le plus proche de la similarité demandée
+    """
+    return min(
+        ((nb_permutations // lignes, lignes) for lignes in range(1, nb_permutations + 1)),
+        key=lambda decoupage: abs((1 / decoupage[0]) ** (1 / decoupage[1]) - seuil),
+    )
+
+class IndexDoublons:
+    """
+    Index LSH des documents canoniques, alimenté au fil de l'eau
+    - seuil : similarité de Jaccard estimée à partir de laquelle deux documents sont des doublons
+    - taille_ngramme : nombre de mots consécutifs par élément comparé (1 : ensembles de mots)
+    """
+    def __init__(self, seuil=0.8, nb_permutations=128, taille_ngramme=2, graine=1):
+        self.seuil = seuil
+        self.taille_ngramme = taille_ngramme
+        self.bandes, self.lignes = choisir_bandes(nb_permutations, seuil)
+        rng = np.random.default_rng(graine)
+        self.a = rng.integers(1, PREMIER, size=(nb_permutations, 1), dtype=np.uint64)
+        self.b = rng.integers(0, PREMIER, size=(nb_permutations, 1), dtype=np.uint64)
+        self.seaux = [{} for _ in range(self.bandes)]
+        self.signatures = {}
+
+    def signature(self, mots):
+        """Signature MinHash d'une liste de mots (tableau de nb_permutations entiers)"""
+        n = self.taille_ngramme
+        ngrammes = {" ".join(mots[i:i + n]) for i in range(max(len(mots) - n + 1, 1))} if mots else set()
+        if not ngrammes:
+            return np.full(len(self.a), PREMIER, dtype=np.uint64)
+        # Empreinte stable d'un processus à l'autre (hash() est aléatoire par processus)
+        x = np.array(
+            [int.from_bytes(hashlib.blake2b(ngramme.encode('utf-8'), digest_size=4).digest(), 'little')
+             for ngramme in ngrammes],
+            dtype=np.uint64,
+        )
+        return ((self.a * (x % np.uint64(PREMIER))[None, :] + self.b) % np.uint64(PREMIER)).min(axis=1)
+
+    def chercher(self, signature):
+        """Document canonique le plus proche au-dessus du seuil : (identifiant, similarité) ou None"""
+        candidats = set()
+        for bande, seaux in enumerate(self.seaux):
+            candidats.update(seaux.get(self._cle(signature, bande), ()))
+        meilleur = None
+        for identifiant in candidats:
+            similarite = float(np.mean(self.signatures[identifiant] == signature))
+            if similarite >= self.seuil and (meilleur is None or similarite > meilleur[1]):
+                meilleur = (identifiant, similarite)
+        return meilleur
+
+    def ajouter(self, identifiant, signature):
+        self.signatures[identifiant] = signature
+        for bande, seaux in enumerate(self.seaux):
+            seaux.setdefault(self._cle(signature, bande), []).append(identifiant)
+
+    def canonique(self, identifiant, mots):
+        """Identifiant du document canonique de mots ; un document nouveau est ajouté et se renvoie lui-même"""
+        signature = self.signature(mots)
+        trouve = self.chercher(signature)
+        if trouve is not None:
+            return trouve[0]
+        self.ajouter(identifiant, signature)
+        return identifiant
+
+    def _cle(self, signature, bande):
+        return signature[bande * self.lignes:(bande + 1) * self.lignes].tobytes()
+
+def dedoublonner(textes_liste_mots, seuil=0.8, **options):
+    """
+    Position du document canonique de chaque texte (sa propre position s'il n'a pas de doublon)
+    - textes_liste_mots : listes de mots nettoyés (ex : sortie de nettoyer_texte)
+    - options : paramètres de IndexDoublons (nb_permutations, taille_ngramme, graine)
+    """
+    index = IndexDoublons(seuil, **options)
+    return [index.canonique(i, mots) for i, mots in enumerate(textes_liste_mots)]
+
+def rapport_doublons(canoniques, textes_liste_mots=None):
+    """
+    Calcul évité grâce au dédoublonnage : documents (et mots) qui n'ont pas besoin d'être analysés
+    Renvoie {"documents", "doublons", "part_documents", "mots", "mots_evites", "part_mots"}.
+    """
+    doublons = [i for i, canonique in enumerate(canoniques) if canonique != i]
+    rapport = {
+        "documents": len(canoniques),
+        "doublons": len(doublons),
+        "part_documents": len(doublons) / len(canoniques) if canoniques else 0.0,
+    }
+    if textes_liste_mots is not None:
+        total = sum(len(mots) for mots in textes_liste_mots)
+        evites = sum(len(textes_liste_mots[i]) for i in doublons)
+        rapport.update(mots=total, mots_evites=evites, part_mots=evites / total if total else 0.0)
+    return rapport
+
+def afficher_rapport_doublons(rapport):
+    print("\n♻️ Quasi-doublons :")
+    print(f"Documents : {rapport['documents']} dont {rapport['doublons']} doublon(s) "
+          f"({rapport['part_documents']:.1%} d'analyses évitées)")
+    if "mots" in rapport:
+        print(f"Mots      : {rapport['mots_evites']} sur {rapport['mots']} non retraités ({rapport['part_mots']:.1%})")
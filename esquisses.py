@@ -0,0 +1,231 @@
+import hashlib
+import heapq
+import math
+import time
+from collections import Counter
+
+import numpy as np
+
+# Fréquences de mots approchées en mémoire constante, pour les flux sans fin (fil d'actualité).
+# - Count-Min : estimation de la fréquence de n'importe quel mot. L'estimation n'est jamais
+#   inférieure à la vraie valeur et la dépasse d'au plus epsilon × total avec une probabilité
+#   d'au moins 1 - delta (largeur = ⌈e / epsilon⌉, profondeur = ⌈ln(1 / delta)⌉).
+# - Space-Saving : les k mots les plus fréquents. Tout mot de fréquence > total / k est présent ;
+#   le compte d'un mot suivi dépasse sa vraie valeur d'au plus son `erreur` (≤ total / k).
+# Les esquisses de même configuration se fusionnent (ex : une par processus de travail).
+# Fenêtres : décroissance exponentielle (demi_vie) ou fenêtre glissante (FenetreGlissante).
+# Mémoire de la table Count-Min : 8 × largeur × profondeur octets, soit ~1,5 Mo avec les valeurs
+# par défaut (epsilon=1e-4, delta=1e-3 : 7 × 27183), plus ~k entrées Space-Saving.
+
+def _empreintes(mots):
+    """Deux empreintes 32 bits par mot, stables d'un processus à l'autre (contrairement à hash())"""
+    empreintes = np.array(
+        [int.from_bytes(hashlib.blake2b(mot.encode('utf-8'), digest_size=8).digest(), 'little') for mot in mots],
+        dtype=np.uint64,
+    )
+    return empreintes & np.uint64(0xFFFFFFFF), (empreintes >> np.uint64(32)) | np.uint64(1)
+
+class FrequencesApprochees:
+    """
+    Count-Min + Space-Saving, utilisable à la place d'un Counter pour le rapport et le nuage de mots
+    - epsilon, delta : bornes d'erreur du Count-Min (voir plus haut)
+    - k : nombre de mots suivis par Space-Saving
+    - demi_vie : en secondes ; si renseignée, les comptes décroissent exponentiellement avec le temps
+    """
+    def __init__(self, epsilon=1e-4, delta=1e-3, k=200, demi_vie=None):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.k = k
+        self.demi_vie = demi_vie
+        self.largeur = math.ceil(math.e / epsilon)
+        self.profondeur = math.ceil(math.log(1 / delta))
+        self.table = np.zeros((self.profondeur, self.largeur), dtype=np.float64)
+        self.total = 0.0
+        # Space-Saving : {mot: [compte, erreur]} et tas (compte, mot) à invalidation paresseuse
+        self.suivis = {}
+        self.tas = []
+        self.instant = None
+
+    # ---- Mise à jour -----------------------------------------------------------------------
+
+    def ajouter(self, mots, instant=None):
+        """Ajouter un lot de mots (liste, ou {mot: nombre}) observé à `instant` (time.time() par défaut)"""
+        if self.demi_vie is not None:
+            self._vieillir(time.time() if instant is None else instant)
+        comptes = mots if isinstance(mots, dict) else Counter(mots)
+        if not comptes:
+            return self
+
+        mots_lot = list(comptes)
+        valeurs = np.fromiter(comptes.values(), dtype=np.float64, count=len(comptes))
+        colonnes = self._colonnes(mots_lot)
+        for ligne in range(self.profondeur):
+            np.add.at(self.table[ligne], colonnes[ligne], valeurs)
+        self.total += float(valeurs.sum())
+
+        for mot, valeur in zip(mots_lot, valeurs):
+            self._suivre(mot, float(valeur))
+        return self
+
+    def _colonnes(self, mots):
+        """Colonne de chaque mot dans chaque ligne de la table (double hachage)"""
+        h1, h2 = _empreintes(mots)
+        lignes = np.arange(self.profondeur, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + lignes * h2[None, :]) % np.uint64(self.largeur)).astype(np.int64)
+
+    def _suivre(self, mot, valeur):
+        """Space-Saving : incrémenter un mot suivi, ou remplacer le mot au plus petit compte"""
+        if mot in self.suivis:
+            self.suivis[mot][0] += valeur
+            return
+        if len(self.suivis) < self.k:
+            self.suivis[mot] = [valeur, 0.0]
+            heapq.heappush(self.tas, (valeur, mot))
+            return
+        # Le nouveau mot hérite du plus petit compte, qui devient sa marge d'erreur
+        minimum, remplace = self._minimum()
+        heapq.heappop(self.tas)
+        del self.suivis[remplace]
+        self.suivis[mot] = [minimum + valeur, minimum]
+        heapq.heappush(self.tas, (minimum + valeur, mot))
+
+    def _minimum(self):
+        """Plus petit compte suivi ; les entrées du tas devenues obsolètes sont remises à jour"""
+        while True:
+            compte, mot = self.tas[0]
+            actuel = self.suivis.get(mot)
+            if actuel is not None and actuel[0] == compte:
+                return compte, mot
+            heapq.heappop(self.tas)
+            if actuel is not None:
+                heapq.heappush(self.tas, (actuel[0], mot))
+
+    def _vieillir(self, instant):
+        """Décroissance exponentielle de tous les comptes depuis la dernière mise à jour"""
+        if self.instant is not None and instant > self.instant:
+            self.decroitre(0.5 ** ((instant - self.instant) / self.demi_vie))
+        if self.instant is None or instant > self.instant:
+            self.instant = instant
+
+    def decroitre(self, facteur):
+        """Multiplier tous les comptes par `facteur` (l'ordre des mots suivis est conservé)"""
+        self.table *= facteur
+        self.total *= facteur
+        for compte in self.suivis.values():
+            compte[0] *= facteur
+            compte[1] *= facteur
+        self.tas = [(compte, mot) for mot, (compte, _) in self.suivis.items()]
+        heapq.heapify(self.tas)
+        return self
+
+    def fusionner(self, autre):
+        """Ajouter une esquisse de même configuration (ex : calculée par un autre processus)"""
+        if (autre.largeur, autre.profondeur) != (self.largeur, self.profondeur):
+            raise ValueError("Esquisses incompatibles : epsilon et delta doivent être identiques.")
+        if self.demi_vie is not None and autre.instant is not None:
+            self._vieillir(autre.instant)
+            if self.instant > autre.instant:
+                autre = autre.copie().decroitre(0.5 ** ((self.instant - autre.instant) / self.demi_vie))
+        self.table += autre.table
+        self.total += autre.total
+
+        # Un mot absent d'une esquisse pleine peut y avoir eu jusqu'à son plus petit compte
+        plancher_self = self._minimum()[0] if len(self.suivis) >= self.k else 0.0
+        plancher_autre = min(c for c, _ in autre.suivis.values()) if len(autre.suivis) >= autre.k else 0.0
+        for mot in list(self.suivis):
+            if mot not in autre.suivis:
+                self.suivis[mot][0] += plancher_autre
+                self.suivis[mot][1] += plancher_autre
+        for mot, (compte, erreur) in autre.suivis.items():
+            if mot in self.suivis:
+                self.suivis[mot][0] += compte
+                self.suivis[mot][1] += erreur
+            else:
+                self.suivis[mot] = [compte + plancher_self, erreur + plancher_self]
+
+        # On ne garde que les k plus grands comptes
+        gardes = heapq.nlargest(self.k, self.suivis.items(), key=lambda item: item[1][0])
+        self.suivis = {mot: compte for mot, compte in gardes}
+        self.tas = [(compte, mot) for mot, (compte, _) in self.suivis.items()]
+        heapq.heapify(self.tas)
+        return self
+
+    def copie(self):
+        nouvelle = FrequencesApprochees(self.epsilon, self.delta, self.k, self.demi_vie)
+        nouvelle.table = self.table.copy()
+        nouvelle.total = self.total
+        nouvelle.suivis = {mot: list(compte) for mot, compte in self.suivis.items()}
+        nouvelle.tas = list(self.tas)
+        nouvelle.instant = self.instant
+        return nouvelle
+
+    # ---- Lecture (interface de Counter utilisée par le rapport et le nuage de mots) -----------
+
+    def estimer(self, mot):
+        """Fréquence estimée d'un mot quelconque (Count-Min)"""
+        colonnes = self._colonnes([mot])[:, 0]
+        return self._valeur(self.table[np.arange(self.profondeur), colonnes].min())
+
+    def _valeur(self, compte):
+        """Comptes entiers sans décroissance, comme un Counter"""
+        return float(compte) if self.demi_vie is not None else int(compte)
+
+    def __getitem__(self, mot):
+        return self.estimer(mot)
+
+    def most_common(self, n=None):
+        """Les n mots suivis les plus fréquents : liste de (mot, fréquence) comme Counter.most_common"""
+        items = sorted(
+            ((mot, self._valeur(compte)) for mot, (compte, _) in self.suivis.items()),
+            key=lambda item: item[1], reverse=True,
+        )
+        return items if n is None else items[:n]
+
+    def items(self):
+        """Mots suivis et leur fréquence (suffit à WordCloud.generate_from_frequencies)"""
+        return self.most_common()
+
+    def keys(self):
+        """Mots suivis ; dict(esquisse) associe alors à chacun son estimation Count-Min"""
+        return self.suivis.keys()
+
+    def erreurs(self):
+        """Surestimation maximale du compte de chaque mot suivi : {mot: erreur}"""
+        return {mot: erreur for mot, (_, erreur) in self.suivis.items()}
+
+    def __len__(self):
+        return len(self.suivis)
+
+class FenetreGlissante:
+    """
+    Fréquences sur les `nb_panneaux` dernières périodes de `duree_panneau` secondes
+    Une esquisse par période ; la fenêtre est la fusion des panneaux encore valides.
+    Chaque panneau a sa propre table Count-Min : la mémoire est d'environ
+    (nb_panneaux + 1) × 8 × ⌈e / epsilon⌉ × ⌈ln(1 / delta)⌉ octets. Par défaut (une heure en
+    12 panneaux de 5 minutes, epsilon=1e-3) : 13 × 152 Ko ≈ 2 Mo, contre ~91 Mo pour
+    60 panneaux à epsilon=1e-4.
+    - options : autres paramètres de FrequencesApprochees (delta, k)
+    """
+    def __init__(self, duree_panneau=300, nb_panneaux=12, epsilon=1e-3, **options):
+        self.duree_panneau = duree_panneau
+        self.nb_panneaux = nb_panneaux
+        self.options = {"epsilon": epsilon, **options}
+        self.panneaux = {}
+
+    def ajouter(self, mots, instant=None):
+        instant = time.time() if instant is None else instant
+        numero = int(instant // self.duree_panneau)
+        if numero not in self.panneaux:
+            self.panneaux[numero] = FrequencesApprochees(**self.options)
+        self.panneaux[numero].ajouter(mots)
+        # Les panneaux sortis de la fenêtre sont libérés : la mémoire reste bornée
+        for ancien in [n for n in self.panneaux if n <= numero - self.nb_panneaux]:
+            del self.panneaux[ancien]
+        return self
+
+    def esquisse(self):
+        """Esquisse de toute la fenêtre (fusion des panneaux)"""
+        fenetre = FrequencesApprochees(**self.options)
+        for numero in sorted(self.panneaux):
+            fenetre.fusionner(self.panneaux[numero])
+        return fenetre
@@ -1,57 +1,136 @@
-import spacy
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.text_rank import TextRankSummarizer
-from collections import Counter
-
-# Charger le modèle spaCy français
-nlp = spacy.load("fr_core_news_sm")
-
-# Thèmes déjà définis (mêmes que classification_texte.py)
-THEMES = {
-    "science": ["recherche", "univers", "physique", "biologie", "experience"],
-    "politique": ["gouvernement", "president", "loi", "parlement", "hollande", "macron"],
-    "sport": ["match", "joueur", "football", "tennis", "but"],
-    "économie": ["argent", "finance", "banque", "economie", "bourse"],
-    "technologie": ["intelligence", "algorithme", "ordinateur", "digital", "robot"],
-}
+import numpy as np
+from scipy.sparse import csr_matrix
+from cache_nlp import analyser, analyser_lot
+from normalisation import lemmes_nettoyes
+from themes import scorer_mots, theme_dominant
+from tfidf import calculer_idf, ponderer_tfidf
+from mesures import chronometrer
 
-def detecter_theme_par_motcles(mots):
-    scores = {theme: 0 for theme in THEMES}
-    for mot in mots:
-        for theme, keywords in THEMES.items():
-            if mot in keywords:
-                scores[theme] += 1
-    theme_dominant = max(scores, key=scores.get)
-    return theme_dominant if scores[theme_dominant] > 0 else "Inconnu"
+# Thèmes déjà définis : définition partagée dans themes.json
+
+# TextRank : facteur d'amortissement, tolérance et nombre maximal d'itérations de la méthode de la puissance
+AMORTISSEMENT = 0.85
+TOLERANCE = 1e-6
+ITERATIONS_MAX = 100
 
+def detecter_theme_par_motcles(mots):
+    return theme_dominant(scorer_mots(mots))
+
+def phrases_doc(doc):
+    """Phrases d'un Doc (profil "phrases" ou "unifie") : liste de couples (texte, mots nettoyés)"""
+    return [(sent.text.strip(), lemmes_nettoyes(sent)) for sent in doc.sents if sent.text.strip()]
+
+def _vecteurs_par_document(phrases_par_document):
+    """
+    Vecteurs TF-IDF (normalisés L2) de toutes les phrases du lot, une ligne par phrase
+    Les colonnes sont propres à chaque document (couple document, mot) : le produit X @ X.T
+    ne relie ainsi que des phrases d'un même document, sans jamais le calculer explicitement.
+    L'IDF est calculé sur les phrases de chaque document, comme s'il était analysé seul :
+    les scores d'un document ne dépendent pas des autres documents du lot.
+    Renvoie (X, document de chaque phrase).
+    """
+    listes_mots = [mots for phrases in phrases_par_document for _, mots in phrases]
+    documents = np.repeat(np.arange(len(phrases_par_document)), [len(phrases) for phrases in phrases_par_document])
+
+    # Colonne de chaque couple (document, mot), numérotée au fil de la lecture
+    colonnes_mots = {}
+    lignes, colonnes = [], []
+    for i, mots in enumerate(listes_mots):
+        document = documents[i]
+        for mot in mots:
+            lignes.append(i)
+            colonnes.append(colonnes_mots.setdefault((document, mot), len(colonnes_mots)))
+    comptes = csr_matrix(
+        (np.ones(len(lignes), dtype=np.float64), (lignes, colonnes)),
+        shape=(len(listes_mots), len(colonnes_mots)),
+    )
+    comptes.sum_duplicates()
+
+    # df : phrases contenant le mot ; n : phrases de son document
+    df = np.bincount(comptes.indices, minlength=len(colonnes_mots))
+    document_colonne = np.zeros(len(colonnes_mots), dtype=np.int64)
+    document_colonne[colonnes] = documents[lignes]
+    nb_phrases = np.bincount(documents, minlength=len(phrases_par_document))[document_colonne]
+    return ponderer_tfidf(comptes, calculer_idf(df, nb_phrases)), documents
+
+def textrank(X, documents, amortissement=AMORTISSEMENT, tolerance=TOLERANCE, iterations_max=ITERATIONS_MAX):
+    """
+    Scores TextRank des phrases de plusieurs documents à la fois
+    Le graphe est la similarité cosinus entre phrases d'un même document (W = X @ X.T sans la
+    diagonale) ; il n'est jamais matérialisé : chaque itération fait deux produits creux en O(nnz).
+    Renvoie (scores TextRank, centralité : similarité de chaque phrase au reste de son document).
+    """
+    n = X.shape[0]
+    Xt = X.T.tocsr()
+    # Les lignes non vides sont de norme 1 : la diagonale de X @ X.T vaut 1 (ou 0)
+    diagonale = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    centralite = X @ (Xt @ np.ones(n)) - diagonale
+    degres = np.where(centralite > 0, centralite, 1)
+    taille_document = np.bincount(documents)[documents]
+
+    scores = np.full(n, 1.0) / taille_document
+    for _ in range(iterations_max):
+        poids = scores / degres
+        nouveaux = (1 - amortissement) / taille_document + amortissement * (X @ (Xt @ poids) - diagonale * poids)
+        ecart = np.abs(nouveaux - scores).max(initial=0)
+        scores = nouveaux
+        if ecart < tolerance:
+            break
+    return scores, centralite
+
+def sujets_docs(docs, nb_phrases=1):
+    """
+    Phrase clé et résumé TextRank de plusieurs Doc en un seul calcul
+    - docs : Doc spaCy avec découpage en phrases (profil "phrases" ou "unifie")
+    - nb_phrases : nombre de phrases du résumé, restituées dans l'ordre du texte
+    Renvoie une liste de {"phrase_cle", "resume", "mots"}, un par Doc.
+    """
+    phrases_par_document = [phrases_doc(doc) for doc in docs]
+    if not any(phrases_par_document):
+        return [{"phrase_cle": "", "resume": "", "mots": []} for _ in phrases_par_document]
+
+    X, documents = _vecteurs_par_document(phrases_par_document)
+    scores, centralite = textrank(X, documents)
+
+    resultats, debut = [], 0
+    for phrases in phrases_par_document:
+        fin = debut + len(phrases)
+        if not phrases:
+            resultats.append({"phrase_cle": "", "resume": "", "mots": []})
+            continue
+        # Phrase clé : la plus proche de l'ensemble du document (mêmes vecteurs que TextRank)
+        phrase_cle = phrases[int(np.argmax(centralite[debut:fin]))][0]
+        meilleures = sorted(np.argsort(-scores[debut:fin], kind="stable")[:nb_phrases])
+        resultats.append({
+            "phrase_cle": phrase_cle,
+            "resume": " ".join(phrases[i][0] for i in meilleures),
+            "mots": [mot for _, mots in phrases for mot in mots],
+        })
+        debut = fin
+    return resultats
+
+def sujets_textes(textes, nb_phrases=1, batch_size=100, n_process=1):
+    """Mode par lots : phrase clé et résumé de textes bruts (avec leur ponctuation), voir sujets_docs"""
+    docs = analyser_lot(textes, "phrases", batch_size=batch_size, n_process=n_process)
+    return sujets_docs(list(docs), nb_phrases=nb_phrases)
+
+@chronometrer("identifier_phrase_cle")
 def identifier_phrase_cle(texte):
-    """Étape 6.1 : Trouver la phrase contenant les termes importants"""
-    doc = nlp(texte)
-    mots_importants = [token.lemma_ for token in doc if token.pos_ in {"NOUN", "PROPN", "VERB"} and not token.is_stop]
-    compteur = Counter(mots_importants)
-
-    phrase_cle = ""
-    score_max = 0
-    for sent in doc.sents:
-        mots_sentence = [token.lemma_ for token in sent if token.lemma_ in compteur]
-        score = sum(compteur[mot] for mot in mots_sentence)
-        if score > score_max:
-            score_max = score
-            phrase_cle = sent.text
-
-    return phrase_cle.strip()
+    """Étape 6.1 : Trouver la phrase la plus représentative du texte brut"""
+    return phrase_cle_doc(analyser(texte, "phrases"))
+
+def phrase_cle_doc(doc):
+    """Phrase clé d'un Doc déjà analysé (lemmes et phrases)"""
+    return sujets_docs([doc])[0]["phrase_cle"]
 
+@chronometrer("resumer_texte")
 def resumer_texte(texte, nb_phrases=1):
-    """Étape 6.2 : Résumer avec TextRank (Sumy)"""
-    parser = PlaintextParser.from_string(texte, Tokenizer("french"))
-    summarizer = TextRankSummarizer()
-    resultats = summarizer(parser.document, nb_phrases)
-    return " ".join(str(phrase) for phrase in resultats)
+    """Étape 6.2 : Résumer le texte brut avec TextRank (graphe creux de similarité entre phrases)"""
+    return sujets_docs([analyser(texte, "phrases")], nb_phrases=nb_phrases)[0]["resume"]
 
 def comparer_theme_et_sujet(mots, phrase_sujet, theme_detecte):
     """Étape 6.3 : Comparer le sujet extrait et le thème classé"""
-    doc = nlp(phrase_sujet)
+    doc = analyser(phrase_sujet, "lemmes")
     mots_sujet = [token.lemma_ for token in doc if not token.is_stop]
     sujet_theme = detecter_theme_par_motcles(mots_sujet)
 
@@ -63,28 +142,43 @@ def comparer_theme_et_sujet(mots, phrase_sujet, theme_detecte):
         print("✅ Sujet et thème cohérents.")
     else:
         print("⚠️ Sujet et thème ne correspondent pas totalement.")
+    return sujet_theme
 
-def analyser_sujet(liste_mots):
-    """Pipeline principal"""
-    texte = " ".join(liste_mots)
+def analyser_sujet(texte, nb_phrases=1):
+    """
+    Pipeline principal, sur le texte brut : les phrases doivent être conservées
+    (une liste de mots déjà nettoyés est acceptée mais ne forme qu'une seule phrase)
+    """
+    if isinstance(texte, list):
+        texte = " ".join(texte)
+    sujet = sujets_docs([analyser(texte, "phrases")], nb_phrases=nb_phrases)[0]
 
     # Étape 6.1
-    phrase_cle = identifier_phrase_cle(texte)
+    phrase_cle = sujet["phrase_cle"]
     print("\n🧠 Phrase clé identifiée :", phrase_cle)
 
     # Étape 6.2
-    resume = resumer_texte(texte)
+    resume = sujet["resume"]
     print("\n✍️ Résumé TextRank :", resume)
 
     # Étape 6.3
-    theme = detecter_theme_par_motcles(liste_mots)
-    comparer_theme_et_sujet(liste_mots, phrase_cle, theme)
+    theme = detecter_theme_par_motcles(sujet["mots"])
+    sujet_theme = comparer_theme_et_sujet(sujet["mots"], phrase_cle, theme)
 
-if __name__ == "__main__":
-    texte_macron = [
-        'emmanuel', 'macron', 'decembre', 'amien', 'homme', 'etat', 'francai', 'presider', 'republique', 'mai', 'parcours', 'marque', 'ascension', 'rapide', 'allier', 'experience', 'fonction', 'public', 'secteur', 'prive', 'politique', 'formation', 'debut', 'professionnel', 'etude', 'philosophie', 'universite', 'pari', 'nanterr', 'emmanuel', 'macron', 'integre', 'institut', 'etude', 'politique', 'pari', 'science', 'po', 'ecole', 'national', 'administration', 'ener', 'sortir', 'diplome', 'debute', 'carriere', 'qu', 'inspecteur', 'finance', 'rejoindre', 'banque', 'affaire', 'rothschild', 'cie', 'devenir', 'associ', 'gerer', 'parcour', 'politique', 'emmanuel', 'macron', 'nomm', 'secretair', 'general', 'adjoint', 'presidence', 'republique', 'francoi', 'hollande', 'an', 'tard', 'devenir', 'ministre', 'economie', 'industrie', 'numerique', 'gouvernement', 'manuel', 'valls', 'poste', 'qu', 'occuper', 'mandat', 'promouvoir', 'reforme', 'viser', 'liberaliser', 'economie', 'francais', 'presidence', 'republique', 'avril', 'emmanuel', 'macron', 'fondre', 'mouvement', 'politique', 'marche', 'annonce', 'candidature', 'election', 'presidentiell', 'elu', 'mai', 'devenir', 'jeune', 'president', 'republique', 'francais', 'mandat', 'marque', 'reforme', 'economique', 'social', 'defi', 'manifestation', 'gilet', 'jaune', 'gestion', 'pandemie', 'covid', 'reelu', 'presider', 'francai', 'decennie', 'obtenir', 'second', 'mandat', 'defi', 'critique', 'reelection', 'emmanuel', 'macron', 'face', 'instabilit', 'politique', 'accroître', 'decision', 'convoquer', 'election', 'legislative', 'anticipees', 'conduire', 'parlement', 'fragment', 'compliquer', 'formation', 'gouvernement', 'stable', 'situation', 'entraine', 'critique', 'gestion', 'pouvoir', 'alimenter', 'debat', 'style', 'leadership', 'vie', 'prive', 'emmanuel', 'macron', 'marier', 'brigitte', 'trogneu', 'ancien', 'professeure', 'lettre', 'an', 'ainee', 'union', 'bien', 'mediatisee', 'temoign', 'relation', 'solide', 'complice'
-    ]
-
-    analyser_sujet(texte_macron)
+    return {"phrase_cle": phrase_cle, "resume": resume, "theme": theme, "theme_sujet": sujet_theme}
 
-# ne marche pas
\ No newline at end of file
+if __name__ == "__main__":
+    texte_macron = (
+        "Emmanuel Macron, né le 21 décembre 1977 à Amiens, est un homme d'État français, président de la République "
+        "depuis mai 2017. Son parcours est marqué par une ascension rapide, alliant expérience dans la fonction publique "
+        "et le secteur privé. Après des études de philosophie à l'université Paris-Nanterre, il intègre Sciences Po puis "
+        "l'École nationale d'administration. Inspecteur des finances, il rejoint la banque d'affaires Rothschild & Cie. "
+        "Nommé secrétaire général adjoint de la présidence sous François Hollande, il devient ministre de l'Économie, "
+        "de l'Industrie et du Numérique dans le gouvernement de Manuel Valls. En avril 2016, il fonde le mouvement "
+        "politique En Marche et annonce sa candidature à l'élection présidentielle. Élu en mai 2017, il devient le plus "
+        "jeune président de la République française. Son mandat est marqué par des réformes économiques et sociales, "
+        "la crise des gilets jaunes et la gestion de la pandémie de Covid-19. Réélu en 2022, il fait face à une "
+        "instabilité politique accrue après la dissolution et les élections législatives anticipées."
+    )
+
+    analyser_sujet(texte_macron, nb_phrases=2)
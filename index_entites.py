@@ -0,0 +1,167 @@
+"""
+Index des entités nommées d'un corpus, sur disque (SQLite)
+
+Pour chaque entité normalisée (minuscules, sans accents, voir preparer_texte) et son type :
+le nombre de mentions, le nombre de documents et la liste des documents qui la citent.
+L'index se met à jour par lots : réindexer un document remplace ses anciennes mentions,
+sans retraiter le reste du corpus.
+
+Utilisation :
+  python index_entites.py entites.sqlite --indexer corpus.jsonl
+  python index_entites.py entites.sqlite --top PER
+  python index_entites.py entites.sqlite --documents "Emmanuel Macron"
+"""
+import argparse
+import sqlite3
+from collections import Counter, deque
+
+from cache_nlp import analyser_lot
+from normalisation import preparer_texte
+
+def ouvrir_index(chemin):
+    """Connexion à l'index (créé au besoin)"""
+    connexion = sqlite3.connect(chemin)
+    connexion.executescript(
+        "CREATE TABLE IF NOT EXISTS entites ("
+        "id INTEGER PRIMARY KEY, forme TEXT, type TEXT, libelle TEXT,"
+        "nb_mentions INTEGER DEFAULT 0, nb_documents INTEGER DEFAULT 0, UNIQUE (forme, type));"
+        "CREATE TABLE IF NOT EXISTS mentions ("
+        "entite INTEGER, document TEXT, nb INTEGER, PRIMARY KEY (entite, document)) WITHOUT ROWID;"
+        "CREATE INDEX IF NOT EXISTS idx_mentions_document ON mentions (document);"
+        "CREATE INDEX IF NOT EXISTS idx_entites_type ON entites (type, nb_mentions DESC);"
+    )
+    return connexion
+
+def normaliser_entite(texte):
+    """Forme sous laquelle une entité est indexée : "Zinédine  Zidane" → "zinedine zidane" """
+    return " ".join(preparer_texte(texte).split())
+
+def _retirer(connexion, documents):
+    # Sous-requête corrélée plutôt que UPDATE ... FROM (SQLite >= 3.33 seulement)
+    connexion.executemany(
+        "UPDATE entites SET nb_mentions = nb_mentions - "
+        "(SELECT nb FROM mentions WHERE mentions.entite = entites.id AND mentions.document = ?), "
+        "nb_documents = nb_documents - 1 "
+        "WHERE id IN (SELECT entite FROM mentions WHERE document = ?)",
+        ((document, document) for document in documents),
+    )
+    connexion.executemany("DELETE FROM mentions WHERE document = ?", ((document,) for document in documents))
+    connexion.execute("DELETE FROM entites WHERE nb_documents <= 0")
+
+def retirer_documents(connexion, documents):
+    """Retirer les mentions de documents déjà indexés et mettre à jour les compteurs"""
+    with connexion:
+        _retirer(connexion, [str(document) for document in documents])
+
+def indexer_entites(connexion, documents):
+    """
+    Ajouter un lot de documents à l'index, en une transaction
+    - documents : itérable de (identifiant, [(texte, type), ...]) (ex : regrouper_entites(doc)["entites"])
+    Un document déjà présent est réindexé. Renvoie le nombre de documents indexés.
+    """
+    mentions = {}
+    libelles = {}
+    for document, entites in documents:
+        comptes = Counter()
+        for texte, type_entite in entites:
+            forme = normaliser_entite(texte)
+            if forme:
+                comptes[forme, type_entite] += 1
+                libelles.setdefault((forme, type_entite), texte)
+        mentions[str(document)] = comptes
+    if not mentions:
+        return 0
+
+    # Totaux du lot par entité, puis une seule mise à jour par entité
+    totaux = Counter()
+    nb_documents = Counter()
+    for comptes in mentions.values():
+        totaux.update(comptes)
+        nb_documents.update(comptes.keys())
+    with connexion:
+        # Documents déjà indexés : leurs anciennes mentions sont remplacées
+        _retirer(connexion, list(mentions))
+        connexion.executemany(
+            "INSERT INTO entites (forme, type, libelle, nb_mentions, nb_documents) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (forme, type) DO UPDATE SET "
+            "nb_mentions = nb_mentions + excluded.nb_mentions, nb_documents = nb_documents + excluded.nb_documents",
+            ((forme, type_entite, libelles[forme, type_entite], nb, nb_documents[forme, type_entite])
+             for (forme, type_entite), nb in totaux.items()),
+        )
+        connexion.executemany(
+            "INSERT INTO mentions (entite, document, nb) "
+            "SELECT id, ?, ? FROM entites WHERE forme = ? AND type = ?",
+            ((document, nb, forme, type_entite)
+             for document, comptes in mentions.items()
+             for (forme, type_entite), nb in comptes.items()),
+        )
+    return len(mentions)
+
+def indexer_textes(connexion, documents, batch_size=100, n_process=1):
+    """
+    NER sur les textes bruts (majuscules conservées) par lots, puis indexation au fil de l'eau
+    - documents : itérable de (identifiant, texte), ex : pipeline.lire_documents
+    Renvoie le nombre de documents indexés.
+    """
+    # Identifiants mis de côté au fil de la lecture : analyser_lot conserve l'ordre
+    identifiants = deque()
+    def textes():
+        for identifiant, texte in documents:
+            identifiants.append(identifiant)
+            yield texte
+
+    total, lot = 0, []
+    for doc in analyser_lot(textes(), "ner", batch_size=batch_size, n_process=n_process):
+        lot.append((identifiants.popleft(), [(ent.text, ent.label_) for ent in doc.ents]))
+        if len(lot) == batch_size:
+            total += indexer_entites(connexion, lot)
+            lot = []
+    if lot:
+        total += indexer_entites(connexion, lot)
+    return total
+
+def documents_mentionnant(connexion, entite, type_entite=None, limite=None):
+    """Documents citant une entité (texte libre, normalisé comme à l'indexation) : [(document, nb), ...]"""
+    requete = (
+        "SELECT m.document, SUM(m.nb) AS total FROM entites e JOIN mentions m ON m.entite = e.id "
+        "WHERE e.forme = ?" + (" AND e.type = ?" if type_entite else "") +
+        " GROUP BY m.document ORDER BY total DESC, m.document" + (" LIMIT ?" if limite else "")
+    )
+    parametres = [normaliser_entite(entite)] + ([type_entite] if type_entite else []) + ([limite] if limite else [])
+    return connexion.execute(requete, parametres).fetchall()
+
+def top_entites(connexion, type_entite=None, n=10):
+    """Entités les plus citées (d'un type ou de tous) : [(libelle, type, nb_mentions, nb_documents), ...]"""
+    if type_entite:
+        return connexion.execute(
+            "SELECT libelle, type, nb_mentions, nb_documents FROM entites WHERE type = ? "
+            "ORDER BY nb_mentions DESC, forme LIMIT ?", (type_entite, n),
+        ).fetchall()
+    return connexion.execute(
+        "SELECT libelle, type, nb_mentions, nb_documents FROM entites ORDER BY nb_mentions DESC, forme LIMIT ?", (n,),
+    ).fetchall()
+
+if __name__ == "__main__":
+    from pipeline import lire_documents
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("index", help="Fichier SQLite de l'index")
+    parser.add_argument("--indexer", nargs="+", metavar="CORPUS", help="Fichiers .txt / .jsonl à (ré)indexer")
+    parser.add_argument("--champ", default="texte")
+    parser.add_argument("--top", nargs="?", const="", metavar="TYPE", help="Entités les plus citées (d'un type)")
+    parser.add_argument("--documents", metavar="ENTITE", help="Documents mentionnant une entité")
+    parser.add_argument("-n", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    connexion = ouvrir_index(args.index)
+    if args.indexer:
+        nb = indexer_textes(connexion, lire_documents(args.indexer, args.champ), args.batch_size, args.n_process)
+        print(f"✅ {nb} document(s) indexé(s).")
+    if args.top is not None:
+        for libelle, type_entite, nb_mentions, nb_documents in top_entites(connexion, args.top or None, args.n):
+            print(f"{libelle} ({type_entite}) : {nb_mentions} mention(s), {nb_documents} document(s)")
+    if args.documents:
+        for document, nb in documents_mentionnant(connexion, args.documents, limite=args.n):
+            print(f"{document} : {nb}")
@@ -0,0 +1,45 @@
+import functools
+import os
+import time
+
+# Chronométrage optionnel des étapes d'analyse.
+# Désactivé par défaut (coût négligeable) ; activé par activer_mesures() ou MESURES_ETAPES=1.
+# Chaque appel d'une étape décorée par @chronometrer est cumulé dans MESURES et transmis
+# aux rappels enregistrés (ex : envoi vers un système de métriques en production).
+CONFIG = {"actif": os.environ.get("MESURES_ETAPES") == "1", "rappels": []}
+
+MESURES = {}
+
+def activer_mesures(rappel=None):
+    """Activer le chronométrage ; rappel(etape, duree_s) est appelé après chaque étape"""
+    CONFIG["actif"] = True
+    if rappel is not None:
+        CONFIG["rappels"].append(rappel)
+
+def desactiver_mesures():
+    CONFIG["actif"] = False
+    CONFIG["rappels"].clear()
+
+def reinitialiser_mesures():
+    MESURES.clear()
+
+def chronometrer(etape):
+    """Décorateur : mesure la durée de chaque appel de la fonction sous le nom `etape`"""
+    def decorateur(fonction):
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            if not CONFIG["actif"]:
+                return fonction(*args, **kwargs)
+            debut = time.perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                duree = time.perf_counter() - debut
+                mesure = MESURES.setdefault(etape, {"appels": 0, "duree_s": 0.0, "duree_max_s": 0.0})
+                mesure["appels"] += 1
+                mesure["duree_s"] += duree
+                mesure["duree_max_s"] = max(mesure["duree_max_s"], duree)
+                for rappel in CONFIG["rappels"]:
+                    rappel(etape, duree)
+        return enveloppe
+    return decorateur
@@ -0,0 +1,53 @@
+import spacy
+from functools import lru_cache
+
+# Modèle spaCy français partagé par tous les scripts
+NOM_MODELE = "fr_core_news_sm"
+
+# Composants du pipeline fr_core_news_sm (senter est désactivé par défaut)
+COMPOSANTS_MODELE = (
+    "tok2vec", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"
+)
+
+# Composants nécessaires selon l'usage :
+# - le lemmatiseur a besoin des POS (morphologizer + attribute_ruler)
+# - on garde tok2vec partout car les autres composants peuvent l'écouter
+# - unifie : une seule analyse du texte brut pour toutes les étapes de pipeline.py
+PROFILS = {
+    "lemmes": ("tok2vec", "morphologizer", "attribute_ruler", "lemmatizer"),
+    "ner": ("tok2vec", "ner"),
+    "phrases": ("tok2vec", "morphologizer", "senter", "attribute_ruler", "lemmatizer"),
+    "unifie": ("tok2vec", "morphologizer", "senter", "attribute_ruler", "lemmatizer", "ner"),
+    "complet": ("tok2vec", "morphologizer", "parser", "attribute_ruler", "lemmatizer", "ner"),
+}
+
+@lru_cache(maxsize=None)
+def _charger(composants):
+    """Charger le modèle avec uniquement les composants demandés (une fois par ensemble)"""
+    exclus = [nom for nom in COMPOSANTS_MODELE if nom not in composants]
+    try:
+        nlp = spacy.load(NOM_MODELE, exclude=exclus)
+    except OSError:
+        print(f"Erreur : le modèle spaCy '{NOM_MODELE}' n'est pas installé.")
+        raise
+    for nom in composants:
+        if nom in nlp.disabled:
+            nlp.enable_pipe(nom)
+    return nlp
+
+def charger_modele(profil="complet"):
+    """
+    Renvoie le modèle spaCy adapté au profil, chargé au premier appel puis mis en cache
+    - profil : une clé de PROFILS ("lemmes", "ner", "phrases", "unifie", "complet")
+    """
+    if profil not in PROFILS:
+        raise ValueError(f"Profil inconnu : '{profil}' (attendu : {', '.join(PROFILS)}).")
+    return charger_composants(PROFILS[profil])
+
+def charger_composants(composants):
+    """Modèle avec un ensemble quelconque de composants (ex : union de plusieurs profils)"""
+    return _charger(frozenset(composants))
+
+def vider_cache():
+    """Libérer tous les modèles chargés"""
+    _charger.cache_clear()
@@ -0,0 +1,125 @@
+import codecs
+import unicodedata
+
+# Étapes de normalisation partagées par clear-text.py et pipeline.py
+
+# Liste personnalisée de mots à supprimer
+mots_a_supprimer = {
+    "le", "la", "les", "un", "une", "des", "de", "du", "au", "aux", "en",
+    "l", "d", "ce", "ces", "cet", "cette", "mon", "ton", "son", "ma", "ta",
+    "sa", "mes", "tes", "ses", "nos", "vos", "leurs"
+}
+
+def enlever_accents(texte):
+    """Remplacer les caractères accentués par leurs équivalents sans accent"""
+    texte = unicodedata.normalize('NFD', texte)
+    texte = texte.encode('ascii', 'ignore').decode('utf-8')
+    return texte
+
+# Lettres sans décomposition Unicode vers l'ASCII (sinon perdues par enlever_accents)
+LIGATURES = {
+    "œ": "oe", "æ": "ae", "ß": "ss", "ø": "o", "đ": "d", "ð": "d", "ł": "l", "þ": "th", "ı": "i",
+}
+
+# Octet → minuscule si lettre ASCII, conservé si espace ou non ASCII (traité au décodage), espace sinon
+TABLE_OCTETS = bytes(
+    code + 32 if 65 <= code <= 90
+    else code if 97 <= code <= 122 or chr(code).isspace() or code >= 128
+    else 32
+    for code in range(256)
+)
+
+# Accents les plus courants en français une fois décomposés (aigu, grave, circonflexe, tréma, cédille),
+# supprimés directement sur les octets UTF-8
+ACCENTS_COURANTS = [chr(code).encode('utf-8') for code in (0x301, 0x300, 0x302, 0x308, 0x327)]
+
+def _plier_caractere(caractere):
+    """Remplacement ASCII d'un caractère non ASCII restant après décomposition NFKD"""
+    # Accent combinant, ou moitié de paire de substitution isolée (texte coupé, JSON mal formé)
+    if unicodedata.combining(caractere) or unicodedata.category(caractere) == "Cs":
+        return ""
+    return LIGATURES.get(caractere.lower(), " ")
+
+# Remplacements déjà calculés, par suite d'octets non ASCII (œ, ’, accents rares...)
+_PLIS = {}
+
+def _erreur_normalisation(erreur):
+    """
+    Gestionnaire d'erreur du décodage ASCII : remplace d'un coup toute la suite d'octets
+    non ASCII (accents supprimés, ligatures dépliées, autres caractères → espace)
+    """
+    octets, fin = erreur.object, erreur.start
+    while fin < len(octets) and octets[fin] >= 128:
+        fin += 1
+    morceau = octets[erreur.start:fin]
+    remplacement = _PLIS.get(morceau)
+    if remplacement is None:
+        remplacement = "".join(_plier_caractere(caractere) for caractere in morceau.decode('utf-8', 'surrogatepass'))
+        if len(_PLIS) > 10000:
+            _PLIS.clear()
+        _PLIS[morceau] = remplacement
+    return remplacement, fin
+
+codecs.register_error("normalisation", _erreur_normalisation)
+
+def preparer_texte(texte):
+    """
+    Minuscules, suppression des accents et de tout sauf lettres et espaces
+    Passes en C uniquement (NFKD, suppression des accents courants, table d'octets),
+    Python n'intervenant que pour les caractères rares ; les ligatures (œ, æ...) sont
+    dépliées au lieu d'être perdues comme avec enlever_accents.
+    """
+    if texte.isascii():
+        return texte.encode('ascii').translate(TABLE_OCTETS).decode('ascii')
+    octets = unicodedata.normalize('NFKD', texte).encode('utf-8', 'surrogatepass')
+    for accent in ACCENTS_COURANTS:
+        octets = octets.replace(accent, b"")
+    return octets.translate(TABLE_OCTETS).decode('ascii', 'normalisation')
+
+def preparer_fichier(chemin, taille_bloc=1 << 20):
+    """
+    preparer_texte en mode flux, pour les fichiers trop gros pour tenir en mémoire
+    Renvoie un générateur de blocs normalisés d'environ taille_bloc caractères,
+    coupés sur une espace pour ne pas séparer un mot entre deux blocs.
+    """
+    reste = ""
+    with open(chemin, 'r', encoding='utf-8') as f:
+        while True:
+            bloc = f.read(taille_bloc)
+            if not bloc:
+                break
+            bloc = reste + preparer_texte(bloc)
+            coupure = max(bloc.rfind(" "), bloc.rfind("\n"))
+            if coupure == -1:
+                reste = bloc
+                continue
+            reste = bloc[coupure + 1:]
+            yield bloc[:coupure + 1]
+    if reste:
+        yield reste
+
+def filtrer_tokens(doc):
+    """Garder les lemmes des tokens utiles d'un Doc spaCy"""
+    return [
+        token.lemma_
+        for token in doc
+        if not token.is_stop
+        and token.text not in mots_a_supprimer
+        and not token.is_punct
+        and not token.is_space
+    ]
+
+def lemmes_nettoyes(doc):
+    """
+    Mots nettoyés à partir d'un Doc du texte brut (non normalisé)
+    Équivalent approché de nettoyer_texte, sans re-parser le texte normalisé :
+    la normalisation est appliquée aux lemmes.
+    """
+    mots = []
+    for token in doc:
+        if token.is_stop or token.is_punct or token.is_space:
+            continue
+        for mot in preparer_texte(token.lemma_).split():
+            if mot not in mots_a_supprimer:
+                mots.append(mot)
+    return mots
@@ -0,0 +1,82 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from wordcloud import WordCloud
+
+# Rendu des nuages de mots sans affichage : directement en PNG / SVG, fichier ou mémoire.
+# Pas de pyplot ni de fenêtre, donc utilisable sur des machines sans écran.
+# L'instance WordCloud (police, masque, dimensions) est créée une fois par processus.
+
+FORMATS = ("png", "svg")
+
+@lru_cache(maxsize=None)
+def creer_wordcloud(largeur=800, hauteur=400, fond="white", police=None, masque=None):
+    """
+    Instance WordCloud réutilisable, mise en cache par configuration
+    - police : chemin d'un fichier de police (sinon police par défaut de wordcloud)
+    - masque : chemin d'une image dont les zones blanches restent vides
+    """
+    if masque is not None:
+        from PIL import Image
+        masque = np.array(Image.open(masque))
+    return WordCloud(width=largeur, height=hauteur, background_color=fond, font_path=police, mask=masque)
+
+def rendre_wordcloud(frequences, destination=None, format="png", **options):
+    """
+    Générer un nuage de mots à partir de fréquences ({mot: fréquence}, Counter...)
+    - destination : chemin de fichier, objet fichier binaire, ou None pour renvoyer les octets
+    - options : configuration passée à creer_wordcloud
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu : '{format}' (attendu : {', '.join(FORMATS)}).")
+    if not _a_des_mots(frequences):
+        # generate_from_frequencies échoue sinon avec un message peu parlant
+        raise ValueError("Aucun mot à dessiner : les fréquences sont vides.")
+
+    wordcloud = creer_wordcloud(**options)
+    wordcloud.generate_from_frequencies(frequences)
+
+    if format == "svg":
+        donnees = wordcloud.to_svg(embed_font=options.get("police") is not None).encode("utf-8")
+    else:
+        tampon = io.BytesIO()
+        wordcloud.to_image().save(tampon, format="PNG")
+        donnees = tampon.getvalue()
+
+    if destination is None:
+        return donnees
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, 'wb') as f:
+            f.write(donnees)
+    else:
+        destination.write(donnees)
+    return destination
+
+def _a_des_mots(frequences):
+    return any(freq > 0 for freq in frequences.values())
+
+def _rendre_element(element):
+    nom, frequences, dossier, format, options = element
+    if not _a_des_mots(frequences):
+        return None
+    chemin = os.path.join(dossier, f"{nom}.{format}")
+    rendre_wordcloud(frequences, chemin, format=format, **options)
+    return chemin
+
+def rendre_wordclouds(elements, dossier, format="png", n_process=None, **options):
+    """
+    Générer de nombreux nuages de mots en parallèle (un processus par cœur par défaut)
+    - elements : itérable de couples (nom, fréquences) ; chaque nuage est écrit dans dossier/nom.format
+    Renvoie la liste des chemins écrits, dans l'ordre des éléments ;
+    None (et aucun fichier) pour un élément sans mot.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    # items() : fonctionne pour un dict, un Counter comme pour une esquisse (voir esquisses.py)
+    taches = ((nom, dict(frequences.items()), dossier, format, options) for nom, frequences in elements)
+    if n_process == 1:
+        return [_rendre_element(tache) for tache in taches]
+    with ProcessPoolExecutor(max_workers=n_process) as executeur:
+        return list(executeur.map(_rendre_element, taches, chunksize=8))
@@ -0,0 +1,280 @@
+"""
+Pipeline d'analyse unifié : une seule analyse spaCy par document, partagée par toutes les étapes
+
+Étapes disponibles (ETAPES) :
+- nettoyage : liste des mots nettoyés (équivalent de nettoyer_texte)
+- frequence : 10 mots les plus fréquents
+- tfidf : 10 mots les plus caractéristiques (calculé sur tout le corpus)
+- ner : entités nommées regroupées par type, détectées sur le texte brut
+- theme : thème par similarité aux centroïdes des mots-clés (calculé sur tout le corpus)
+- sujet : phrase clé et résumé TextRank
+- clusters : regroupement des documents sans thème connu
+
+Utilisation : python pipeline.py mon_texte.txt [corpus.jsonl ...] --etapes nettoyage,ner --sortie rapport.jsonl
+"""
+import argparse
+import json
+import time
+from collections import Counter, deque
+
+from cache_nlp import analyser_lot
+from clustering import clusteriser_matrice
+from extraction_sujet import sujets_docs
+from index_entites import indexer_entites, ouvrir_index
+from mesures import chronometrer
+from doublons import IndexDoublons, afficher_rapport_doublons, rapport_doublons
+from normalisation import lemmes_nettoyes, preparer_texte
+from themes import SEUIL_SIMILARITE, classer_corpus
+from tfidf import ajuster_tfidf, transformer_tfidf, mots_tfidf
+
+ETAPES = ("nettoyage", "frequence", "tfidf", "ner", "theme", "sujet", "clusters")
+
+def lire_documents(chemins, champ="texte"):
+    """
+    Documents à analyser, sous forme de couples (identifiant, texte)
+    - fichier .jsonl : un document par ligne, texte dans `champ`, identifiant dans "id" si présent
+    - autre fichier : le fichier entier est un document, identifié par son chemin
+    """
+    for chemin in chemins:
+        with open(chemin, 'r', encoding='utf-8') as f:
+            if not chemin.endswith(".jsonl"):
+                yield chemin, f.read()
+                continue
+            for numero, ligne in enumerate(f, start=1):
+                if not ligne.strip():
+                    continue
+                try:
+                    objet = json.loads(ligne)
+                    yield objet.get("id", f"{chemin}:{numero}"), objet[champ]
+                except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                    print(f"Erreur : {chemin} ligne {numero} ignorée (JSON invalide ou champ '{champ}' absent).")
+
+# Chaque étape est chronométrée sous le nom "pipeline_<étape>" (voir mesures.py)
+
+@chronometrer("pipeline_nettoyage")
+def _nettoyage(doc):
+    return lemmes_nettoyes(doc)
+
+@chronometrer("pipeline_frequence")
+def _frequences(mots):
+    return [{"mot": mot, "freq": freq} for mot, freq in Counter(mots).most_common(10)]
+
+@chronometrer("pipeline_ner")
+def _entites(doc):
+    entites = {"PER": [], "LOC": [], "ORG": [], "MISC": []}
+    for ent in doc.ents:
+        entites.setdefault(ent.label_, []).append(ent.text)
+    return entites
+
+@chronometrer("pipeline_sujet")
+def _sujet(doc):
+    return sujets_docs([doc])[0]
+
+@chronometrer("pipeline_vectorisation")
+def _vectoriser(listes_mots, modele=None):
+    """Matrice TF-IDF du corpus ; le modèle est ajusté sur le corpus s'il n'est pas fourni"""
+    modele = modele or ajuster_tfidf(listes_mots)
+    return transformer_tfidf(modele, listes_mots), modele
+
+@chronometrer("pipeline_tfidf")
+def _mots_caracteristiques(X, modele):
+    """10 mots de plus fort score TF-IDF de chaque document"""
+    features = mots_tfidf(modele)
+    caracteristiques = []
+    for i in range(X.shape[0]):
+        ligne = X[i].tocoo()
+        meilleurs = sorted(zip(ligne.col, ligne.data), key=lambda x: x[1], reverse=True)[:10]
+        caracteristiques.append([{"mot": features[idx], "score": round(float(score), 4)} for idx, score in meilleurs])
+    return caracteristiques
+
+@chronometrer("pipeline_theme")
+def _themes(listes_mots):
+    return [themes[0][0] for themes in classer_corpus(listes_mots, seuil=SEUIL_SIMILARITE)]
+
+@chronometrer("pipeline_clusters")
+def _clusters(X, themes):
+    """Cluster de chaque document sans thème connu (None pour les autres)"""
+    clusters = [None] * len(themes)
+    positions = [i for i, theme in enumerate(themes) if theme == "Inconnu"]
+    if positions:
+        for i, label in zip(positions, clusteriser_matrice(X[positions], n_clusters="auto")):
+            clusters[i] = int(label)
+    return clusters
+
+def analyser_document(doc, etapes):
+    """Étapes par document, toutes calculées à partir du même Doc"""
+    mots = _nettoyage(doc)
+    resultat = {}
+
+    if "nettoyage" in etapes:
+        resultat["mots"] = mots
+
+    if "frequence" in etapes:
+        resultat["frequences"] = _frequences(mots)
+
+    if "ner" in etapes:
+        resultat["entites"] = _entites(doc)
+
+    if "sujet" in etapes:
+        sujet = _sujet(doc)
+        resultat["phrase_cle"] = sujet["phrase_cle"]
+        resultat["resume"] = sujet["resume"]
+
+    return resultat, mots
+
+def executer_pipeline(documents, etapes=ETAPES, batch_size=100, n_process=1, modele_tfidf=None, index_entites=None,
+                      seuil_doublons=None, stats=None):
+    """
+    Analyser un corpus en une passe
+    - documents : itérable de couples (identifiant, texte), voir lire_documents
+    - etapes : sous-ensemble de ETAPES
+    - modele_tfidf : modèle TF-IDF déjà ajusté (voir tfidf.py), sinon ajusté sur le corpus
+    - index_entites : connexion à un index d'entités (voir index_entites.py), alimenté par
+      l'étape ner à chaque lot de batch_size documents
+    - seuil_doublons : si renseigné, les quasi-doublons (MinHash, voir doublons.py) d'un document
+      déjà lu ne sont pas analysés et reprennent ses résultats (champ "doublon_de")
+    - stats : dictionnaire optionnel rempli avec le rapport de dédoublonnage (rapport_doublons)
+    Renvoie une liste de dictionnaires, un par document. spaCy analysant les textes par lots,
+    la durée d'un document n'est pas mesurable seule : "duree_ms_moyenne_lot" est la durée de
+    son lot de batch_size documents (analyse et étapes par document) divisée par la taille du lot.
+    Les durées des étapes sont détaillées par mesures.py ("pipeline_<étape>").
+    """
+    etapes = set(etapes)
+    inconnues = etapes - set(ETAPES)
+    if inconnues:
+        raise ValueError(f"Étape(s) inconnue(s) : {', '.join(sorted(inconnues))} (attendu : {', '.join(ETAPES)}).")
+
+    # Les identifiants sont mis de côté au fil de la lecture : analyser_lot conserve l'ordre
+    identifiants = deque()
+    # Quasi-doublons repérés avant l'analyse spaCy, sur les mots normalisés du texte brut
+    index_doublons = IndexDoublons(seuil_doublons) if seuil_doublons is not None else None
+    canoniques, doublons = [], []
+    def textes():
+        for position, (identifiant, texte) in enumerate(documents):
+            if index_doublons is not None:
+                canoniques.append(index_doublons.canonique(position, preparer_texte(texte).split()))
+                if canoniques[-1] != position:
+                    doublons.append((position, identifiant, canoniques[-1]))
+                    continue
+            identifiants.append((position, identifiant))
+            yield texte
+
+    resultats, positions_lues, listes_mots, a_indexer = [], [], [], []
+    def dater_lot(debut_lot, duree):
+        """Durée moyenne des documents du lot commencé à la position debut_lot"""
+        moyenne = round(duree * 1000 / (len(resultats) - debut_lot), 2)
+        for resultat in resultats[debut_lot:]:
+            resultat["duree_ms_moyenne_lot"] = moyenne
+
+    debut, debut_lot = time.perf_counter(), 0
+    for doc in analyser_lot(textes(), "unifie", batch_size=batch_size, n_process=n_process):
+        resultat, mots = analyser_document(doc, etapes)
+        position, identifiant = identifiants.popleft()
+        positions_lues.append(position)
+        resultats.append({"id": identifiant, **resultat})
+        if etapes & {"tfidf", "theme", "clusters"}:
+            listes_mots.append(mots)
+        if index_entites is not None and "ner" in etapes:
+            a_indexer.append((identifiant, [
+                (texte, type_entite) for type_entite, textes in resultat["entites"].items() for texte in textes
+            ]))
+            if len(a_indexer) == batch_size:
+                indexer_entites(index_entites, a_indexer)
+                a_indexer = []
+        # Fin d'un lot de analyser_lot (même découpage) : le lot suivant sera analysé au prochain tour
+        if len(resultats) - debut_lot == batch_size:
+            dater_lot(debut_lot, time.perf_counter() - debut)
+            debut, debut_lot = time.perf_counter(), len(resultats)
+    if len(resultats) > debut_lot:
+        dater_lot(debut_lot, time.perf_counter() - debut)
+    if a_indexer:
+        indexer_entites(index_entites, a_indexer)
+        a_indexer = []
+
+    # Étapes sur tout le corpus, à partir des mots déjà nettoyés
+    if listes_mots and etapes & {"tfidf", "clusters"}:
+        X, modele = _vectoriser(listes_mots, modele_tfidf)
+
+    if "tfidf" in etapes and listes_mots:
+        for resultat, caracteristiques in zip(resultats, _mots_caracteristiques(X, modele)):
+            resultat["tfidf"] = caracteristiques
+
+    # Un document sans thème au-dessus de SEUIL_SIMILARITE part au clustering (comme detection-sujet.py)
+    if etapes & {"theme", "clusters"} and listes_mots:
+        themes = _themes(listes_mots)
+        if "theme" in etapes:
+            for resultat, theme in zip(resultats, themes):
+                resultat["theme"] = theme
+
+    if "clusters" in etapes and listes_mots:
+        for resultat, cluster in zip(resultats, _clusters(X, themes)):
+            resultat["cluster"] = cluster
+
+    if index_doublons is not None:
+        if stats is not None:
+            stats.update(rapport_doublons(canoniques))
+        # Chaque doublon reprend les résultats de son document canonique, à sa place dans le corpus
+        par_position = dict(zip(positions_lues, resultats))
+        for position, identifiant, canonique in doublons:
+            copie = {**par_position[canonique], "id": identifiant, "doublon_de": par_position[canonique]["id"]}
+            # Rien n'a été analysé pour un doublon : pas de durée
+            copie.pop("duree_ms_moyenne_lot", None)
+            par_position[position] = copie
+            if index_entites is not None and "ner" in etapes:
+                a_indexer.append((identifiant, [
+                    (texte, type_entite) for type_entite, textes in copie["entites"].items() for texte in textes
+                ]))
+        if a_indexer:
+            indexer_entites(index_entites, a_indexer)
+        resultats = [par_position[position] for position in sorted(par_position)]
+    return resultats
+
+def ecrire_resultats(resultats, chemin):
+    """Écrire les résultats en JSON Lines, ou en Parquet si le chemin finit par .parquet"""
+    if chemin.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("L'export Parquet nécessite pyarrow (pip install pyarrow).")
+        # from_pylist ne lit les colonnes que dans la première ligne : chaque ligne reçoit
+        # toutes les clés rencontrées (None si absente, ex : "doublon_de" des seuls doublons)
+        colonnes = list(dict.fromkeys(cle for resultat in resultats for cle in resultat))
+        lignes = [{colonne: resultat.get(colonne) for colonne in colonnes} for resultat in resultats]
+        pq.write_table(pa.Table.from_pylist(lignes), chemin)
+        return
+
+    with open(chemin, 'w', encoding='utf-8') as f:
+        for resultat in resultats:
+            f.write(json.dumps(resultat, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fichiers", nargs="+", help="Fichiers texte (un document chacun) ou corpus .jsonl")
+    parser.add_argument("--etapes", default=",".join(ETAPES), help="Étapes séparées par des virgules")
+    parser.add_argument("--champ", default="texte", help="Champ contenant le texte dans un .jsonl")
+    parser.add_argument("--sortie", help="Fichier .jsonl ou .parquet (sinon affichage JSON)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--index-entites", help="Index SQLite des entités à mettre à jour (étape ner)")
+    parser.add_argument("--seuil-doublons", type=float, help="Similarité (0-1) au-delà de laquelle un document "
+                        "quasi identique à un document déjà lu n'est pas réanalysé")
+    args = parser.parse_args()
+
+    stats = {}
+    resultats = executer_pipeline(
+        lire_documents(args.fichiers, args.champ),
+        etapes=[etape.strip() for etape in args.etapes.split(",") if etape.strip()],
+        batch_size=args.batch_size,
+        n_process=args.n_process,
+        index_entites=ouvrir_index(args.index_entites) if args.index_entites else None,
+        seuil_doublons=args.seuil_doublons,
+        stats=stats,
+    )
+    if stats:
+        afficher_rapport_doublons(stats)
+    if args.sortie:
+        ecrire_resultats(resultats, args.sortie)
+        print(f"✅ {len(resultats)} document(s) analysé(s) → {args.sortie}")
+    else:
+        print(json.dumps(resultats, ensure_ascii=False, indent=2))
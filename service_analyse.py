@@ -0,0 +1,333 @@
+"""
+Service HTTP local d'analyse : les fonctions des scripts exposées derrière un serveur asyncio
+
+Les modèles spaCy restent chargés dans un pool de processus (pas de démarrage à froid par
+requête). Les petites requêtes concurrentes de nettoyage et de NER sont regroupées en lots
+envoyés à nlp.pipe. Au-delà de --max-en-cours requêtes simultanées, le service répond 503.
+
+Points d'entrée (POST, corps JSON) :
+- /nettoyer_texte   {"texte": "..."}                → {"mots": [...]}
+- /analyse_ner      {"texte": "..."}                → {"entites": [...], "par_type": {...}}
+- /classer_texte    {"mots": [...]}                 → {"theme_motcles": ..., "theme_nlp": ...}
+- /traiter_textes   {"textes": [[...], ...]}        → {"nouveaux_themes": {...}}
+                    (dédoublonnage sur demande : "seuil_doublons", ex : 0.8)
+- /analyser_sujet   {"texte": "..."}                → {"phrase_cle": ..., "resume": ..., ...}
+GET /stats : histogramme des latences par point d'entrée.
+
+Utilisation : python service_analyse.py [--port 8000] [--workers 2]
+"""
+import argparse
+import asyncio
+import bisect
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_nlp import analyser_lot
+from modele_nlp import charger_modele
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+
+# Bornes des classes de l'histogramme de latence, en millisecondes
+BORNES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+TAILLE_MAX_CORPS = 10 * 1024 * 1024
+
+# ---- Côté processus de travail -------------------------------------------------------------
+
+SCRIPTS = {}
+
+def _charger_script(nom_fichier):
+    """Importer un script du dépôt (les noms avec tiret ne sont pas importables directement)"""
+    nom_module = nom_fichier[:-3].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(nom_module, os.path.join(RACINE, nom_fichier))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _initialiser_worker():
+    """Charger les scripts et les modèles une fois pour toutes dans chaque processus"""
+    # Les scripts affichent beaucoup : on garde uniquement les réponses JSON
+    sys.stdout = open(os.devnull, 'w')
+    for nom_fichier in ("clear-text.py", "analyse-text.py", "classification_text.py",
+                        "detection-sujet.py", "extraction_sujet.py"):
+        SCRIPTS[nom_fichier] = _charger_script(nom_fichier)
+    for profil in ("lemmes", "ner", "phrases"):
+        charger_modele(profil)
+
+def _isoler_erreurs(fonction, entrees):
+    """
+    Appliquer une fonction de lot ; si le lot échoue, chaque entrée est reprise seule pour que
+    seules les entrées fautives échouent (leur exception prend la place du résultat)
+    """
+    try:
+        return fonction(entrees)
+    except Exception:
+        resultats = []
+        for entree in entrees:
+            try:
+                resultats.append(fonction([entree])[0])
+            except Exception as e:
+                resultats.append(e)
+        return resultats
+
+def _nettoyer(textes):
+    return [{"mots": mots} for mots in SCRIPTS["clear-text.py"].nettoyer_corpus(textes)]
+
+def _nettoyer_lot(textes):
+    return _isoler_erreurs(_nettoyer, textes)
+
+def _ner(entrees):
+    # Texte brut de préférence (majuscules utiles au NER), ou liste de mots des anciens clients
+    textes = (entree if isinstance(entree, str) else " ".join(entree) for entree in entrees)
+    docs = analyser_lot(textes, "ner")
+    return [SCRIPTS["analyse-text.py"].regrouper_entites(doc) for doc in docs]
+
+def _ner_lot(entrees):
+    return _isoler_erreurs(_ner, entrees)
+
+def _classer_texte(requete):
+    theme_motcles, theme_nlp = SCRIPTS["classification_text.py"].classer_texte(requete["mots"])
+    return {"theme_motcles": theme_motcles, "theme_nlp": theme_nlp}
+
+def _traiter_textes(requete):
+    detection = SCRIPTS["detection-sujet.py"]
+    nouveaux_themes = detection.traiter_textes(
+        requete["textes"], n_clusters=requete.get("n_clusters", 2), methode=requete.get("methode", "kmeans"),
+        seuil_doublons=requete.get("seuil_doublons"),
+    )
+    return {"nouveaux_themes": nouveaux_themes}
+
+def _analyser_sujet(requete):
+    # Le texte brut garde les phrases ; "mots" reste accepté pour les anciens clients
+    texte = requete["texte"] if "texte" in requete else requete["mots"]
+    return SCRIPTS["extraction_sujet.py"].analyser_sujet(texte, nb_phrases=requete.get("nb_phrases", 1))
+
+# ---- Côté serveur -------------------------------------------------------------------------
+
+class ErreurRequete(Exception):
+    """Requête invalide : renvoyée au client avec le statut HTTP indiqué"""
+    def __init__(self, statut, message):
+        super().__init__(message)
+        self.statut = statut
+
+class MicroLots:
+    """
+    Regroupe les requêtes arrivées presque en même temps en un seul appel par lot
+    - fonction : fonction (liste d'entrées → liste de résultats) exécutée dans le pool
+    - taille_max : taille de lot déclenchant l'envoi immédiat
+    - delai : attente maximale (s) avant l'envoi d'un lot incomplet
+    """
+    def __init__(self, executeur, fonction, taille_max=32, delai=0.005):
+        self.executeur = executeur
+        self.fonction = fonction
+        self.taille_max = taille_max
+        self.delai = delai
+        self.attente = []
+        self.minuteur = None
+
+    async def soumettre(self, entree):
+        futur = asyncio.get_running_loop().create_future()
+        self.attente.append((entree, futur))
+        if len(self.attente) >= self.taille_max:
+            self._envoyer()
+        elif self.minuteur is None:
+            self.minuteur = asyncio.get_running_loop().call_later(self.delai, self._envoyer)
+        return await futur
+
+    def _envoyer(self):
+        if self.minuteur is not None:
+            self.minuteur.cancel()
+            self.minuteur = None
+        lot, self.attente = self.attente, []
+        if lot:
+            asyncio.ensure_future(self._executer(lot))
+
+    async def _executer(self, lot):
+        entrees = [entree for entree, _ in lot]
+        try:
+            resultats = await asyncio.get_running_loop().run_in_executor(self.executeur, self.fonction, entrees)
+        except Exception as e:
+            for _, futur in lot:
+                if not futur.done():
+                    futur.set_exception(e)
+            return
+        # Une entrée en échec (voir _isoler_erreurs) n'échoue que sa propre requête
+        for (_, futur), resultat in zip(lot, resultats):
+            if futur.done():
+                continue
+            if isinstance(resultat, Exception):
+                futur.set_exception(resultat)
+            else:
+                futur.set_result(resultat)
+
+class ServiceAnalyse:
+    """Serveur HTTP minimal (asyncio), pool de processus et statistiques de latence"""
+    def __init__(self, workers=2, max_en_cours=64, taille_lot=32, delai_lot=0.005):
+        self.workers = workers
+        self.executeur = ProcessPoolExecutor(max_workers=workers, initializer=_initialiser_worker)
+        self.places = asyncio.Semaphore(max_en_cours)
+        self.lots = {
+            "/nettoyer_texte": MicroLots(self.executeur, _nettoyer_lot, taille_lot, delai_lot),
+            "/analyse_ner": MicroLots(self.executeur, _ner_lot, taille_lot, delai_lot),
+        }
+        self.unitaires = {
+            "/classer_texte": _classer_texte,
+            "/traiter_textes": _traiter_textes,
+            "/analyser_sujet": _analyser_sujet,
+        }
+        self.histogrammes = {chemin: [0] * (len(BORNES_MS) + 1) for chemin in (*self.lots, *self.unitaires)}
+
+    async def prechauffer(self):
+        """Démarrer tous les processus du pool pour que leurs modèles soient chargés d'avance"""
+        boucle = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            boucle.run_in_executor(self.executeur, time.sleep, 0.1)
+            for _ in range(self.workers)
+        ))
+
+    async def traiter(self, chemin, requete):
+        """Exécuter un point d'entrée et renvoyer la réponse JSON (dictionnaire)"""
+        if chemin in self.lots:
+            champ = "texte" if chemin == "/nettoyer_texte" or "texte" in requete else "mots"
+            if champ not in requete:
+                raise ErreurRequete(400, f"Champ '{champ}' manquant.")
+            # Vérifié avant la mise en lot : une entrée invalide ne doit pas faire échouer ses voisines
+            valeur = requete[champ]
+            if champ == "texte" and not isinstance(valeur, str):
+                raise ErreurRequete(400, "Champ 'texte' : chaîne de caractères attendue.")
+            if champ == "mots" and not (isinstance(valeur, list) and all(isinstance(mot, str) for mot in valeur)):
+                raise ErreurRequete(400, "Champ 'mots' : liste de chaînes de caractères attendue.")
+            return await self.lots[chemin].soumettre(valeur)
+        if chemin in self.unitaires:
+            boucle = asyncio.get_running_loop()
+            try:
+                return await boucle.run_in_executor(self.executeur, self.unitaires[chemin], requete)
+            except KeyError as e:
+                raise ErreurRequete(400, f"Champ {e} manquant.")
+            except ValueError as e:
+                # Paramètres refusés par la fonction appelée (ex : traiter_textes)
+                raise ErreurRequete(400, str(e))
+        raise ErreurRequete(404, f"Point d'entrée inconnu : {chemin}")
+
+    def enregistrer_latence(self, chemin, duree_ms):
+        if chemin in self.histogrammes:
+            self.histogrammes[chemin][bisect.bisect_left(BORNES_MS, duree_ms)] += 1
+
+    def statistiques(self):
+        """Histogramme et quantiles approchés (borne haute de la classe) par point d'entrée"""
+        stats = {}
+        for chemin, comptes in self.histogrammes.items():
+            total = sum(comptes)
+            quantiles = {}
+            for nom, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                cumul = 0
+                for i, compte in enumerate(comptes):
+                    cumul += compte
+                    if total and cumul >= q * total:
+                        quantiles[nom] = BORNES_MS[i] if i < len(BORNES_MS) else None
+                        break
+            etiquettes = [f"<={borne}ms" for borne in BORNES_MS] + [f">{BORNES_MS[-1]}ms"]
+            stats[chemin] = {"requetes": total, **quantiles, "histogramme": dict(zip(etiquettes, comptes))}
+        return stats
+
+    async def connexion(self, reader, writer):
+        """Lire une requête HTTP/1.1, y répondre puis fermer la connexion"""
+        debut = time.perf_counter()
+        chemin = None
+        try:
+            try:
+                methode, chemin, _ = (await reader.readline()).decode('latin-1').split(" ", 2)
+            except ValueError:
+                raise ErreurRequete(400, "Requête HTTP invalide.")
+            entetes = {}
+            while True:
+                ligne = (await reader.readline()).decode('latin-1').strip()
+                if not ligne:
+                    break
+                nom, _, valeur = ligne.partition(":")
+                entetes[nom.strip().lower()] = valeur.strip()
+
+            if methode == "GET" and chemin == "/stats":
+                statut, reponse = 200, self.statistiques()
+            elif methode != "POST":
+                raise ErreurRequete(405, "Méthode non autorisée (POST attendu).")
+            elif self.places.locked():
+                # Contre-pression : on refuse plutôt que d'accumuler une file sans limite
+                raise ErreurRequete(503, "Service saturé, réessayer plus tard.")
+            else:
+                try:
+                    longueur = int(entetes.get("content-length", 0))
+                except ValueError:
+                    raise ErreurRequete(400, "En-tête Content-Length invalide.")
+                if longueur < 0:
+                    raise ErreurRequete(400, "En-tête Content-Length invalide.")
+                if longueur > TAILLE_MAX_CORPS:
+                    raise ErreurRequete(413, "Corps de requête trop volumineux.")
+                # La place est prise avant de lire le corps : la lecture compte dans max_en_cours
+                async with self.places:
+                    try:
+                        requete = json.loads(await reader.readexactly(longueur) or b"{}")
+                    except asyncio.IncompleteReadError:
+                        raise ErreurRequete(400, "Corps de requête incomplet.")
+                    except json.JSONDecodeError:
+                        raise ErreurRequete(400, "Corps JSON invalide.")
+                    if not isinstance(requete, dict):
+                        raise ErreurRequete(400, "Objet JSON attendu.")
+                    statut, reponse = 200, await self.traiter(chemin, requete)
+        except ErreurRequete as e:
+            statut, reponse = e.statut, {"erreur": str(e)}
+        except Exception as e:
+            statut, reponse = 500, {"erreur": f"Erreur interne : {e}"}
+
+        corps = json.dumps(reponse, ensure_ascii=False, default=str).encode('utf-8')
+        entete = (
+            f"HTTP/1.1 {statut} {'OK' if statut == 200 else 'Erreur'}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corps)}\r\n"
+            + ("Retry-After: 1\r\n" if statut == 503 else "")
+            + "Connection: close\r\n\r\n"
+        )
+        writer.write(entete.encode('latin-1') + corps)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+        if statut == 200:
+            self.enregistrer_latence(chemin, (time.perf_counter() - debut) * 1000)
+
+async def lancer_service(hote="127.0.0.1", port=8000, **options):
+    """Démarrer le service et le faire tourner jusqu'à interruption"""
+    service = ServiceAnalyse(**options)
+    await service.prechauffer()
+    serveur = await asyncio.start_server(service.connexion, hote, port)
+    print(f"🚀 Service d'analyse prêt sur http://{hote}:{port}")
+    try:
+        async with serveur:
+            await serveur.serve_forever()
+    finally:
+        service.executeur.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-en-cours", type=int, default=64)
+    parser.add_argument("--taille-lot", type=int, default=32)
+    parser.add_argument("--delai-lot-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(lancer_service(
+            args.hote, args.port,
+            workers=args.workers,
+            max_en_cours=args.max_en_cours,
+            taille_lot=args.taille_lot,
+            delai_lot=args.delai_lot_ms / 1000,
+        ))
+    except KeyboardInterrupt:
+        print("\n👋 Service arrêté.")
@@ -0,0 +1,72 @@
+import itertools
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+import cache_nlp
+from spacy.tokens import Doc
+from spacy.vocab import Vocab
+
+@pytest.fixture
+def cache(tmp_path):
+    ancienne = dict(cache_nlp.CONFIG)
+    cache_nlp.configurer_cache(actif=True, chemin=str(tmp_path / "analyses.sqlite"))
+    yield cache_nlp
+    cache_nlp.configurer_cache(**{cle: ancienne[cle] for cle in ("actif", "chemin", "taille_max")})
+
+def entree(numero, vocab=Vocab()):
+    return f"cle{numero}", Doc(vocab, words=[f"mot{numero:03d}"] * 20), frozenset({"tok2vec"})
+
+def test_eviction_jusqu_au_seuil_bas(cache, monkeypatch):
+    # Dates d'accès strictement croissantes : l'ordre d'éviction est déterministe
+    horloge = itertools.count(1000)
+    monkeypatch.setattr(cache.time, "time", lambda: float(next(horloge)))
+    taille = len(entree(0)[1].to_bytes(exclude=["tensor", "user_data"]))
+    cache.configurer_cache(taille_max=taille * 20)
+    cache.vider_cache_analyses()
+    for numero in range(21):
+        cache._enregistrer([entree(numero)])
+
+    # Dépassement : les plus anciennes entrées partent jusqu'à 90 % de taille_max
+    apres_eviction = cache.stats_cache()
+    assert apres_eviction["taille_octets"] <= 0.9 * cache.CONFIG["taille_max"]
+    assert cache._taille == apres_eviction["taille_octets"]
+    restantes = {cle for (cle,) in cache._base().execute("SELECT cle FROM analyses")}
+    assert "cle20" in restantes and "cle0" not in restantes
+
+    # L'écriture suivante tient dans la marge : aucune éviction
+    cache._enregistrer([entree(21)])
+    assert cache.stats_cache()["entrees"] == apres_eviction["entrees"] + 1
+
+@pytest.fixture
+def modele_factice(tmp_path, monkeypatch):
+    """Modèle vide dont les composants portent les noms de fr_core_news_sm (sans effet)"""
+    import modele_nlp
+    nlp = spacy.blank("fr")
+    for nom in modele_nlp.COMPOSANTS_MODELE:
+        nlp.add_pipe("sentencizer", name=nom)
+    nlp.to_disk(tmp_path / "modele")
+    monkeypatch.setattr(modele_nlp, "NOM_MODELE", str(tmp_path / "modele"))
+    monkeypatch.setattr(cache_nlp, "NOM_MODELE", str(tmp_path / "modele"))
+    modele_nlp.vider_cache()
+    yield
+    modele_nlp.vider_cache()
+
+def test_une_entree_par_texte_tous_profils(cache, modele_factice):
+    cache.vider_cache_analyses()
+    avant = dict(cache.STATS)
+    list(cache.analyser_lot(["Un texte.", "Un autre."], "lemmes"))
+    # Profil non couvert : ré-analyse avec l'union des composants, l'entrée est remplacée
+    cache.analyser("Un texte.", "ner")
+    # Profils couverts par l'union : réutilisés
+    cache.analyser("Un texte.", "lemmes")
+    cache.analyser("Un texte.", "ner")
+    stats = cache.stats_cache()
+    assert stats["entrees"] == 2
+    assert stats["misses"] - avant["misses"] == 3
+    assert stats["hits"] - avant["hits"] == 2
+    (composants,) = cache._base().execute(
+        "SELECT composants FROM analyses WHERE cle = ?", (cache.cle_cache("Un texte.", cache.charger_modele("ner")),)
+    ).fetchone()
+    assert set(composants.split(",")) == set(cache.PROFILS["lemmes"]) | set(cache.PROFILS["ner"])
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from clustering import clusteriser_flux, clusteriser_matrice, creer_reduction
+from tfidf import ajuster_tfidf, transformer_tfidf
+
+DOCUMENTS = [
+    ["match", "football", "stade"],
+    ["football", "joueur", "stade"],
+    ["match", "joueur", "but"],
+    ["banque", "marche", "inflation"],
+    ["banque", "economie", "marche"],
+    ["inflation", "economie", "taux"],
+]
+
+def test_premier_lot_vide_ignore():
+    modele = ajuster_tfidf(DOCUMENTS)
+    labels = clusteriser_flux(lambda: [[], DOCUMENTS[:3], [], DOCUMENTS[3:]], modele, n_composantes=5)
+    assert len(labels) == len(DOCUMENTS)
+    # k est choisi sur le premier lot non vide, et non fixé à 1 par le lot vide
+    assert len(set(labels)) > 1
+
+def test_flux_sans_document():
+    modele = ajuster_tfidf(DOCUMENTS)
+    assert len(clusteriser_flux(lambda: [[], []], modele)) == 0
+
+def test_reduction_bornee_par_le_nombre_de_documents():
+    modele = ajuster_tfidf(DOCUMENTS)
+    X = transformer_tfidf(modele, DOCUMENTS[:3])
+    reduction = creer_reduction(X, 50)
+    assert reduction.transform(X).shape == (3, 2)
+    assert np.array_equal(clusteriser_matrice(X[:2], n_composantes=50), [0, 1])
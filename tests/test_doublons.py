@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from doublons import IndexDoublons, choisir_bandes, dedoublonner
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+@pytest.mark.parametrize("nb_communs", [10, 50, 100, 150])
+def test_minhash_estime_jaccard(nb_communs):
+    index = IndexDoublons(taille_ngramme=1, nb_permutations=256)
+    a = [f"mot{i}" for i in range(200)]
+    b = [f"mot{i}" for i in range(200 - nb_communs, 400 - nb_communs)]
+    estimation = float(np.mean(index.signature(a) == index.signature(b)))
+    # Écart type de l'estimateur : sqrt(J (1 - J) / 256) ≤ 0.032
+    assert abs(estimation - jaccard(set(a), set(b))) < 0.1
+
+def test_signature_stable():
+    mots = "le match de football au stade".split()
+    assert np.array_equal(IndexDoublons().signature(mots), IndexDoublons().signature(list(mots)))
+
+@pytest.mark.parametrize("seuil", [0.5, 0.8, 0.9])
+def test_choisir_bandes(seuil):
+    bandes, lignes = choisir_bandes(128, seuil)
+    assert bandes * lignes <= 128
+    assert abs((1 / bandes) ** (1 / lignes) - seuil) < 0.1
+
+def test_dedoublonner():
+    texte = [f"mot{i}" for i in range(100)]
+    proche = texte[:99] + ["autre"]
+    different = [f"terme{i}" for i in range(100)]
+    assert dedoublonner([texte, different, proche, list(texte), []]) == [0, 1, 0, 0, 4]
@@ -0,0 +1,63 @@
+from collections import Counter
+
+import numpy as np
+
+from esquisses import FenetreGlissante, FrequencesApprochees
+
+def flux(nb_mots=20000, taille_vocabulaire=2000, graine=0):
+    """Flux de mots de fréquences zipfiennes, reproductible"""
+    rng = np.random.default_rng(graine)
+    rangs = np.minimum(rng.zipf(1.3, size=nb_mots), taille_vocabulaire)
+    return [f"mot{rang}" for rang in rangs]
+
+def verifier_bornes(esquisse, vrais):
+    total = sum(vrais.values())
+    assert esquisse.total == total
+    # Count-Min : jamais sous la vraie valeur, au plus epsilon × total au-dessus
+    for mot, vrai in vrais.items():
+        assert vrai <= esquisse[mot] <= vrai + esquisse.epsilon * total
+    # Space-Saving : tout mot de fréquence > total / k est suivi, compte - erreur ≤ vrai ≤ compte
+    erreurs = esquisse.erreurs()
+    for mot, vrai in vrais.items():
+        if vrai > total / esquisse.k:
+            assert mot in erreurs
+    for mot, compte in esquisse.most_common():
+        assert compte - erreurs[mot] <= vrais[mot] <= compte
+
+def test_bornes_count_min_et_space_saving():
+    mots = flux()
+    esquisse = FrequencesApprochees(epsilon=1e-3, k=50)
+    for debut in range(0, len(mots), 1000):
+        esquisse.ajouter(mots[debut:debut + 1000])
+    verifier_bornes(esquisse, Counter(mots))
+
+def test_fusion_equivalente_au_flux_entier():
+    mots = flux()
+    moitie = len(mots) // 2
+    gauche = FrequencesApprochees(epsilon=1e-3, k=50).ajouter(mots[:moitie])
+    droite = FrequencesApprochees(epsilon=1e-3, k=50).ajouter(mots[moitie:])
+    entier = FrequencesApprochees(epsilon=1e-3, k=50).ajouter(mots)
+    gauche.fusionner(droite)
+    # La table Count-Min est linéaire : la fusion est exacte
+    np.testing.assert_array_equal(gauche.table, entier.table)
+    verifier_bornes(gauche, Counter(mots))
+
+def test_decroissance():
+    esquisse = FrequencesApprochees(epsilon=1e-2, k=10, demi_vie=60)
+    esquisse.ajouter(["a"] * 8 + ["b"] * 4, instant=0)
+    esquisse.ajouter([], instant=60)
+    assert esquisse["a"] == 4.0
+    assert esquisse.most_common(1) == [("a", 4.0)]
+
+def test_interface_counter():
+    esquisse = FrequencesApprochees(epsilon=1e-2, k=10).ajouter(["a", "b", "a"])
+    assert dict(esquisse.items()) == {"a": 2, "b": 1}
+    assert dict(esquisse) == {"a": 2, "b": 1}
+    assert len(esquisse) == 2
+
+def test_fenetre_glissante():
+    fenetre = FenetreGlissante(duree_panneau=60, nb_panneaux=5)
+    for minute in range(10):
+        fenetre.ajouter(["ancien" if minute < 5 else "recent"], instant=minute * 60)
+    assert len(fenetre.panneaux) == 5
+    assert fenetre.esquisse().most_common() == [("recent", 5)]
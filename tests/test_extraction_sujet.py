@@ -0,0 +1,42 @@
+import numpy as np
+
+from extraction_sujet import AMORTISSEMENT, _vecteurs_par_document, textrank
+
+# Phrases déjà nettoyées de trois documents (le texte n'intervient pas dans le calcul)
+PHRASES = [
+    [("", ["match", "football", "stade"]), ("", ["joueur", "football", "but"]),
+     ("", ["stade", "public", "match"]), ("", ["meteo", "pluie"])],
+    [("", ["ministre", "loi", "vote"]), ("", ["loi", "parlement"])],
+    [("", ["banque", "inflation"]), ("", ["marche", "banque", "bourse"]), ("", ["inflation", "prix"]),
+     ("", [])],
+]
+
+def textrank_dense(X):
+    """
+    Référence : PageRank d'un seul document sur le graphe dense W = X Xᵀ sans diagonale,
+    résolu exactement, (I - d W D⁻¹) s = (1 - d) / n
+    """
+    W = (X @ X.T).toarray()
+    np.fill_diagonal(W, 0)
+    degres = W.sum(axis=1)
+    degres[degres == 0] = 1
+    n = W.shape[0]
+    scores = np.linalg.solve(np.eye(n) - AMORTISSEMENT * W / degres, np.full(n, (1 - AMORTISSEMENT) / n))
+    return scores, W.sum(axis=1)
+
+def test_identique_au_calcul_dense_par_document():
+    X, documents = _vecteurs_par_document(PHRASES)
+    scores, centralite = textrank(X, documents, tolerance=1e-12, iterations_max=1000)
+    for document in range(len(PHRASES)):
+        lignes = np.flatnonzero(documents == document)
+        attendus, centralite_attendue = textrank_dense(X[lignes])
+        np.testing.assert_allclose(scores[lignes], attendus, atol=1e-9)
+        np.testing.assert_allclose(centralite[lignes], centralite_attendue, atol=1e-12)
+
+def test_documents_independants():
+    # Un document analysé seul ou avec d'autres reçoit les mêmes scores
+    X, documents = _vecteurs_par_document(PHRASES)
+    scores, _ = textrank(X, documents, tolerance=1e-12, iterations_max=1000)
+    X_seul, documents_seul = _vecteurs_par_document(PHRASES[:1])
+    scores_seul, _ = textrank(X_seul, documents_seul, tolerance=1e-12, iterations_max=1000)
+    np.testing.assert_allclose(scores[documents == 0], scores_seul, atol=1e-9)
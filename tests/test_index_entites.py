@@ -0,0 +1,17 @@
+from index_entites import documents_mentionnant, indexer_entites, ouvrir_index, retirer_documents, top_entites
+
+def test_reindexation_remplace_les_mentions():
+    connexion = ouvrir_index(":memory:")
+    indexer_entites(connexion, [
+        ("d1", [("Paris", "LOC"), ("Paris", "LOC"), ("Emmanuel Macron", "PER")]),
+        ("d2", [("paris", "LOC")]),
+    ])
+    assert top_entites(connexion) == [("Paris", "LOC", 3, 2), ("Emmanuel Macron", "PER", 1, 1)]
+
+    # d1 réindexé : ses anciennes mentions sont retirées des compteurs
+    indexer_entites(connexion, [("d1", [("Lyon", "LOC")])])
+    assert top_entites(connexion) == [("Lyon", "LOC", 1, 1), ("Paris", "LOC", 1, 1)]
+    assert documents_mentionnant(connexion, "Emmanuel Macron") == []
+
+    retirer_documents(connexion, ["d2"])
+    assert top_entites(connexion) == [("Lyon", "LOC", 1, 1)]
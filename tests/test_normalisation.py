@@ -0,0 +1,14 @@
+import json
+
+from normalisation import preparer_texte
+
+def test_accents_et_ponctuation():
+    assert preparer_texte("Élection présidentielle, 2017 !") == "election presidentielle        "
+
+def test_ligatures_depliees():
+    assert preparer_texte("Œuvre") == "oeuvre"
+
+def test_substitution_isolee():
+    # Moitié de paire de substitution (emoji coupé), valide en JSON mais pas encodable en UTF-8
+    texte = json.loads('"caf\\u00e9 \\ud83d texte"')
+    assert preparer_texte(texte) == "cafe  texte"
@@ -0,0 +1,25 @@
+import os
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("wordcloud")
+
+from nuages import rendre_wordcloud, rendre_wordclouds
+
+ELEMENTS = [
+    ("sport", Counter({"match": 3, "football": 2})),
+    ("vide", Counter()),
+    ("economie", {"banque": 1, "inflation": 4}),
+]
+
+def test_frequences_vides_refusees():
+    with pytest.raises(ValueError, match="Aucun mot"):
+        rendre_wordcloud({})
+
+@pytest.mark.parametrize("n_process", [1, 2])
+def test_element_sans_mot_ignore(tmp_path, n_process):
+    chemins = rendre_wordclouds(ELEMENTS, tmp_path, n_process=n_process)
+    assert chemins[1] is None
+    assert [os.path.basename(c) for c in chemins if c] == ["sport.png", "economie.png"]
+    assert sorted(os.listdir(tmp_path)) == ["economie.png", "sport.png"]
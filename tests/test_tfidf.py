@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from tfidf import ajuster_tfidf, charger_tfidf, mettre_a_jour_tfidf, mots_tfidf, sauvegarder_tfidf, transformer_tfidf
+
+sklearn_texte = pytest.importorskip("sklearn.feature_extraction.text")
+
+DOCUMENTS = [
+    ["match", "football", "stade", "match"],
+    ["gouvernement", "ministre", "loi", "vote", "loi"],
+    ["football", "joueur", "but"],
+    ["banque", "marche", "inflation", "marche", "marche"],
+    [],
+    ["ministre", "economie", "banque"],
+]
+
+def reference(documents):
+    """Matrice de TfidfVectorizer (mêmes réglages par défaut) et son vocabulaire"""
+    vectoriseur = sklearn_texte.TfidfVectorizer(analyzer=lambda mots: mots)
+    return vectoriseur.fit_transform(documents).toarray(), vectoriseur.vocabulary_
+
+def dans_ordre_sklearn(matrice, modele, vocabulaire_sklearn):
+    """Colonnes du modèle réordonnées comme celles de sklearn"""
+    dense = np.zeros((matrice.shape[0], len(vocabulaire_sklearn)))
+    for mot, colonne in modele["vocabulaire"].items():
+        dense[:, vocabulaire_sklearn[mot]] = matrice[:, [colonne]].toarray().ravel()
+    return dense
+
+def test_identique_a_sklearn():
+    modele = ajuster_tfidf(DOCUMENTS)
+    attendu, vocabulaire = reference(DOCUMENTS)
+    obtenu = dans_ordre_sklearn(transformer_tfidf(modele, DOCUMENTS), modele, vocabulaire)
+    np.testing.assert_allclose(obtenu, attendu, atol=1e-12)
+
+def test_mises_a_jour_par_lots_identiques_a_sklearn():
+    modele = ajuster_tfidf(DOCUMENTS[:2])
+    mettre_a_jour_tfidf(modele, DOCUMENTS[2:4])
+    mettre_a_jour_tfidf(modele, DOCUMENTS[4:])
+    attendu, vocabulaire = reference(DOCUMENTS)
+    obtenu = dans_ordre_sklearn(transformer_tfidf(modele, DOCUMENTS), modele, vocabulaire)
+    np.testing.assert_allclose(obtenu, attendu, atol=1e-12)
+
+def test_mots_inconnus_ignores():
+    modele = ajuster_tfidf(DOCUMENTS)
+    X = transformer_tfidf(modele, [["football", "inconnu"], ["inconnu"]])
+    assert X.shape == (2, len(modele["vocabulaire"]))
+    assert X[0].nnz == 1 and X[1].nnz == 0
+
+def test_sauvegarde_puis_mise_a_jour(tmp_path):
+    modele = ajuster_tfidf(DOCUMENTS[:3])
+    sauvegarder_tfidf(modele, tmp_path)
+    recharge = charger_tfidf(tmp_path)
+    assert mots_tfidf(recharge) == mots_tfidf(modele)
+    # df est mappé en lecture seule : la mise à jour doit travailler sur une copie
+    mettre_a_jour_tfidf(recharge, DOCUMENTS[3:])
+    attendu, vocabulaire = reference(DOCUMENTS)
+    obtenu = dans_ordre_sklearn(transformer_tfidf(recharge, DOCUMENTS), recharge, vocabulaire)
+    np.testing.assert_allclose(obtenu, attendu, atol=1e-12)
+
+def test_transformer_accepte_un_generateur():
+    modele = ajuster_tfidf(DOCUMENTS)
+    attendu = transformer_tfidf(modele, DOCUMENTS).toarray()
+    np.testing.assert_allclose(transformer_tfidf(modele, (mots for mots in DOCUMENTS)).toarray(), attendu)
+    assert transformer_tfidf(modele, iter([])).shape == (0, len(modele["vocabulaire"]))
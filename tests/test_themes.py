@@ -0,0 +1,50 @@
+import numpy as np
+
+from corpus_ids import encoder_mots, ecrire_corpus, matrice_comptes, ouvrir_corpus
+from themes import classer_corpus, classer_corpus_ids, matrice_scores, matrice_vocabulaire, scorer_ids, scorer_mots
+
+TEXTES = [
+    ["match", "joueur", "stade", "pluie", "match"],
+    ["gouvernement", "ministre", "loi", "economie"],
+    ["chat", "chien"],
+    [],
+]
+
+def test_classement_independant_du_lot():
+    # Les centroïdes ne dépendent pas du corpus : un texte a le même score seul ou en lot
+    en_lot = classer_corpus(TEXTES, k=2)
+    seuls = [classer_corpus([texte], k=2)[0] for texte in TEXTES]
+    assert en_lot == seuls
+    assert en_lot[0][0][0] == "sport"
+    assert en_lot[2] == [("Inconnu", 0.0)]
+
+def test_scorer_ids_identique_a_scorer_mots(tmp_path):
+    ecrire_corpus(tmp_path, TEXTES)
+    corpus = ouvrir_corpus(tmp_path)
+    matrice = matrice_vocabulaire(corpus["vocabulaire"])
+    for texte in TEXTES:
+        assert list(scorer_ids(encoder_mots(corpus, texte), matrice)) == scorer_mots(texte)
+    assert list(scorer_ids([], matrice)) == [0] * matrice.shape[1]
+
+def test_classer_corpus_ids_identique_a_classer_corpus(tmp_path):
+    ecrire_corpus(tmp_path, TEXTES)
+    corpus = ouvrir_corpus(tmp_path)
+    attendu = classer_corpus(TEXTES, k=2)
+    for taille_lot in (1, 10000):
+        obtenu = classer_corpus_ids(corpus, k=2, taille_lot=taille_lot)
+        assert [[theme for theme, _ in themes] for themes in obtenu] == [[theme for theme, _ in themes] for themes in attendu]
+        for themes, themes_attendus in zip(obtenu, attendu):
+            np.testing.assert_allclose([sim for _, sim in themes], [sim for _, sim in themes_attendus])
+
+def test_matrice_comptes_par_lots(tmp_path):
+    ecrire_corpus(tmp_path, TEXTES)
+    corpus = ouvrir_corpus(tmp_path)
+    entiere = matrice_comptes(corpus).toarray()
+    np.testing.assert_array_equal(matrice_comptes(corpus, taille_lot=1).toarray(), entiere)
+    assert entiere[0, corpus["index"]["match"]] == 2
+    assert entiere.sum() == sum(len(texte) for texte in TEXTES)
+
+def test_entree_generateur():
+    attendu = [scorer_mots(texte) for texte in TEXTES]
+    assert matrice_scores((texte for texte in TEXTES), dense=True).tolist() == attendu
+    assert classer_corpus(iter(TEXTES), k=2, taille_lot=3) == classer_corpus(TEXTES, k=2)
@@ -0,0 +1,114 @@
+import json
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Modèle TF-IDF persistant et incrémental, sur des listes de mots déjà tokenisées.
+# Même pondération que TfidfVectorizer par défaut (idf lissé, normalisation L2).
+# Un modèle est un dictionnaire :
+# - vocabulaire : {mot: colonne}
+# - df : nombre de documents contenant chaque mot (tableau NumPy)
+# - nb_documents : nombre de documents vus
+# - idf : poids IDF calculés à partir de df et nb_documents
+
+def creer_tfidf():
+    """Modèle vide, à alimenter avec mettre_a_jour_tfidf"""
+    return {
+        "vocabulaire": {},
+        "df": np.zeros(0, dtype=np.int64),
+        "nb_documents": 0,
+        "idf": np.zeros(0, dtype=np.float64),
+    }
+
+def calculer_idf(df, nb_documents):
+    """IDF lissé : ln((1 + n) / (1 + df)) + 1"""
+    return np.log((1 + nb_documents) / (1 + np.asarray(df, dtype=np.float64))) + 1
+
+def mettre_a_jour_tfidf(modele, textes_liste_mots):
+    """
+    Ajouter un lot de documents au modèle sans repartir de zéro
+    - les nouveaux mots sont ajoutés au vocabulaire
+    - les fréquences documentaires (df) et l'IDF sont mis à jour
+    """
+    vocabulaire = modele["vocabulaire"]
+    colonnes = []
+    nb_documents = 0
+    for mots in textes_liste_mots:
+        nb_documents += 1
+        for mot in set(mots):
+            colonnes.append(vocabulaire.setdefault(mot, len(vocabulaire)))
+
+    df = np.bincount(np.asarray(colonnes, dtype=np.int64), minlength=len(vocabulaire))
+    # Copie de l'ancien df : il peut être mappé en lecture seule depuis le disque
+    df[:len(modele["df"])] += modele["df"]
+
+    modele["df"] = df
+    modele["nb_documents"] += nb_documents
+    modele["idf"] = calculer_idf(df, modele["nb_documents"])
+    return modele
+
+def ajuster_tfidf(textes_liste_mots):
+    """Construire un modèle à partir d'un corpus de référence"""
+    return mettre_a_jour_tfidf(creer_tfidf(), textes_liste_mots)
+
+def transformer_tfidf(modele, textes_liste_mots):
+    """
+    Matrice creuse documents × vocabulaire, sans réajuster le modèle
+    - textes_liste_mots : itérable de listes de mots (liste, générateur...), parcouru une fois
+    Les mots absents du vocabulaire sont ignorés.
+    """
+    vocabulaire = modele["vocabulaire"]
+    # Format CSR construit au fil des documents : indptr donne le début de chaque ligne
+    colonnes, indptr = [], [0]
+    for mots in textes_liste_mots:
+        for mot in mots:
+            colonne = vocabulaire.get(mot)
+            if colonne is not None:
+                colonnes.append(colonne)
+        indptr.append(len(colonnes))
+
+    # Les doublons (ligne, colonne) sont additionnés par ponderer_tfidf : fréquences brutes
+    comptes = csr_matrix(
+        (np.ones(len(colonnes), dtype=np.float64), np.asarray(colonnes, dtype=np.int64), indptr),
+        shape=(len(indptr) - 1, len(vocabulaire)),
+    )
+    return ponderer_tfidf(comptes, modele["idf"])
+
+def ponderer_tfidf(comptes, idf):
+    """Pondérer une matrice creuse de fréquences brutes (documents × vocabulaire) par l'IDF, puis normaliser"""
+    matrice = csr_matrix(comptes, dtype=np.float64, copy=True)
+    matrice.sum_duplicates()
+    matrice.data *= idf[matrice.indices]
+
+    # Normalisation L2 de chaque document
+    normes = np.sqrt(np.asarray(matrice.multiply(matrice).sum(axis=1)).ravel())
+    normes[normes == 0] = 1
+    matrice.data /= np.repeat(normes, np.diff(matrice.indptr))
+    return matrice
+
+def mots_tfidf(modele):
+    """Liste des mots du vocabulaire, dans l'ordre des colonnes"""
+    mots = [None] * len(modele["vocabulaire"])
+    for mot, colonne in modele["vocabulaire"].items():
+        mots[colonne] = mot
+    return mots
+
+def sauvegarder_tfidf(modele, dossier):
+    """Écrire le vocabulaire (JSON) et les tableaux df / idf (.npy) dans un dossier"""
+    os.makedirs(dossier, exist_ok=True)
+    with open(os.path.join(dossier, "vocabulaire.json"), 'w', encoding='utf-8') as f:
+        json.dump({"nb_documents": modele["nb_documents"], "mots": mots_tfidf(modele)}, f, ensure_ascii=False)
+    np.save(os.path.join(dossier, "df.npy"), modele["df"])
+    np.save(os.path.join(dossier, "idf.npy"), modele["idf"])
+
+def charger_tfidf(dossier):
+    """Recharger un modèle sauvegardé ; df et idf sont mappés en mémoire (lecture seule)"""
+    with open(os.path.join(dossier, "vocabulaire.json"), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    return {
+        "vocabulaire": {mot: colonne for colonne, mot in enumerate(meta["mots"])},
+        "df": np.load(os.path.join(dossier, "df.npy"), mmap_mode="r"),
+        "nb_documents": meta["nb_documents"],
+        "idf": np.load(os.path.join(dossier, "idf.npy"), mmap_mode="r"),
+    }
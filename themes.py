@@ -0,0 +1,306 @@
+import json
+import os
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from corpus_ids import matrice_comptes
+from normalisation import preparer_texte
+from tfidf import ponderer_tfidf
+
+# Définition partagée des thèmes (versionnée) utilisée par tous les classifieurs
+CHEMIN_THEMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "themes.json")
+
+def charger_themes(chemin=CHEMIN_THEMES):
+    """Charger la définition des thèmes : renvoie (version, {theme: [mots-clés]})"""
+    with open(chemin, 'r', encoding='utf-8') as f:
+        definition = json.load(f)
+    return definition["version"], definition["themes"]
+
+VERSION_THEMES, THEMES = charger_themes()
+
+def construire_index(themes):
+    """
+    Index inversé mot-clé → identifiants de thèmes
+    Chaque mot-clé est indexé tel quel et sans accents ni majuscules (voir preparer_texte).
+    - noms : liste des thèmes (l'identifiant est la position dans la liste)
+    - mots : {mot-clé: (id_theme, ...)}
+    - mots_cles : liste des mots-clés, colonnes : {mot-clé: position dans mots_cles}
+    - matrice : matrice creuse mots_cles × thèmes pour le mode par lots
+    """
+    noms = list(themes)
+    mots = {}
+    for id_theme, theme in enumerate(noms):
+        for mot_cle in themes[theme]:
+            # Forme d'origine et forme normalisée comme le texte nettoyé ("république" → "republique")
+            for mot in (mot_cle, " ".join(preparer_texte(mot_cle).split())):
+                ids = mots.setdefault(mot, [])
+                if id_theme not in ids:
+                    ids.append(id_theme)
+    mots = {mot: tuple(ids) for mot, ids in mots.items()}
+    mots_cles = list(mots)
+
+    lignes = [i for i, mot in enumerate(mots_cles) for _ in mots[mot]]
+    colonnes = [id_theme for mot in mots_cles for id_theme in mots[mot]]
+    matrice = csr_matrix(
+        (np.ones(len(lignes), dtype=np.int32), (lignes, colonnes)),
+        shape=(len(mots_cles), len(noms)),
+    )
+    return {
+        "noms": noms,
+        "mots": mots,
+        "mots_cles": mots_cles,
+        "colonnes": {mot: i for i, mot in enumerate(mots_cles)},
+        "matrice": matrice,
+    }
+
+@lru_cache(maxsize=None)
+def index_par_defaut():
+    """Index construit une seule fois à partir de themes.json"""
+    return construire_index(THEMES)
+
+def scorer_mots(mots, index=None):
+    """Compter en une passe les mots-clés de chaque thème présents dans une liste de mots"""
+    index = index or index_par_defaut()
+    scores = [0] * len(index["noms"])
+    mots_index = index["mots"]
+    for mot in mots:
+        for id_theme in mots_index.get(mot, ()):
+            scores[id_theme] += 1
+    return scores
+
+def theme_dominant(scores, index=None, seuil=1):
+    """Thème au score le plus élevé (le premier en cas d'égalité), "Inconnu" sous le seuil"""
+    index = index or index_par_defaut()
+    id_max = max(range(len(scores)), key=scores.__getitem__)
+    if scores[id_max] < seuil:
+        return "Inconnu"
+    return index["noms"][id_max]
+
+def matrice_scores(textes_liste_mots, index=None, dense=False):
+    """
+    Mode par lots : scores de tout un corpus en une matrice documents × thèmes
+    - textes_liste_mots : itérable de textes (liste, générateur...), chaque texte étant une liste de mots
+    - dense : renvoyer un tableau NumPy plutôt qu'une matrice creuse
+    """
+    index = index or index_par_defaut()
+    colonnes_mots = index["colonnes"]
+
+    # Format CSR construit au fil des textes : indptr donne le début de chaque ligne
+    colonnes, indptr = [], [0]
+    for mots in textes_liste_mots:
+        for mot in mots:
+            colonne = colonnes_mots.get(mot)
+            if colonne is not None:
+                colonnes.append(colonne)
+        indptr.append(len(colonnes))
+
+    # Documents × mots-clés, puis produit avec la matrice mots-clés × thèmes
+    occurrences = csr_matrix(
+        (np.ones(len(colonnes), dtype=np.int32), np.asarray(colonnes, dtype=np.int64), indptr),
+        shape=(len(indptr) - 1, len(index["mots_cles"])),
+    )
+    occurrences.sum_duplicates()
+    scores = occurrences @ index["matrice"]
+    return scores.toarray() if dense else scores
+
+def matrice_vocabulaire(vocabulaire, index=None):
+    """
+    Matrice creuse vocabulaire × thèmes pour un corpus d'identifiants (voir corpus_ids.py)
+    - vocabulaire : liste des mots, l'identifiant d'un mot étant sa position
+    """
+    index = index or index_par_defaut()
+    mots_index = index["mots"]
+    lignes, colonnes = [], []
+    for id_mot, mot in enumerate(vocabulaire):
+        for id_theme in mots_index.get(mot, ()):
+            lignes.append(id_mot)
+            colonnes.append(id_theme)
+    return csr_matrix(
+        (np.ones(len(lignes), dtype=np.int32), (lignes, colonnes)),
+        shape=(len(vocabulaire), len(index["noms"])),
+    )
+
+def scorer_ids(ids, matrice):
+    """Équivalent de scorer_mots sur un tableau d'identifiants (matrice : voir matrice_vocabulaire)"""
+    # Occurrences de chaque identifiant, puis un produit avec la matrice vocabulaire × thèmes
+    occurrences = np.bincount(np.asarray(ids, dtype=np.int64), minlength=matrice.shape[0])
+    return matrice.T @ occurrences
+
+# ---- Classification par similarité aux centroïdes des thèmes --------------------------------
+
+# Similarité cosinus minimale au centroïde d'un thème pour être classé (sinon → "Inconnu").
+# Calibrée sur mon_texte.txt (texte entier, lignes et phrases) pour reproduire l'ancienne règle
+# « au moins 2 mots-clés du thème » : 28 décisions identiques sur 29 à 0.15.
+SEUIL_SIMILARITE = 0.15
+
+def mots_cles_normalises(themes=None, lemmatiser=False):
+    """
+    Mots-clés de chaque thème normalisés comme par nettoyer_texte : {theme: [mots]}
+    - lemmatiser : passer aussi les mots-clés au lemmatiseur spaCy (profil "lemmes"),
+      sinon seule la normalisation (minuscules, accents) est appliquée
+    """
+    if themes is None:
+        return _mots_cles_par_defaut(lemmatiser)
+    normalises = {theme: [preparer_texte(mot).strip() for mot in mots] for theme, mots in themes.items()}
+    if not lemmatiser:
+        return normalises
+
+    # Import local : le chargement de spaCy n'est nécessaire qu'ici
+    from cache_nlp import analyser_lot
+    from normalisation import filtrer_tokens
+
+    formes = sorted({mot for mots in normalises.values() for mot in mots})
+    lemmes = {}
+    for forme, doc in zip(formes, analyser_lot(formes, "lemmes")):
+        # Un mot-clé filtré comme mot vide (ex : "but") garde sa forme normalisée
+        lemmes[forme] = filtrer_tokens(doc) or [forme]
+    return {
+        theme: list(dict.fromkeys(lemme for mot in mots for lemme in lemmes[mot]))
+        for theme, mots in normalises.items()
+    }
+
+@lru_cache(maxsize=None)
+def _mots_cles_par_defaut(lemmatiser):
+    """Mots-clés de themes.json normalisés une seule fois"""
+    return mots_cles_normalises(THEMES, lemmatiser=lemmatiser)
+
+def construire_centroides(themes=None, graines=None, lemmatiser=False):
+    """
+    Centroïdes des thèmes dans l'espace fixe des mots-clés normalisés, lignes normalisées (L2)
+    L'espace ne dépend que des thèmes (et des graines), pas du corpus classé : un document
+    reçoit la même similarité quel que soit le lot dans lequel il est classé.
+    - graines : {theme: [liste de mots, ...]} documents d'exemple ajoutés au centroïde
+      (leurs mots étendent l'espace des mots-clés)
+    - lemmatiser : voir mots_cles_normalises (charge spaCy)
+    Renvoie {"noms": [...], "colonnes": {mot: colonne}, "matrice": csr thèmes × mots}.
+    """
+    mots_cles = mots_cles_normalises(themes, lemmatiser=lemmatiser)
+    noms = list(mots_cles)
+    graines = graines or {}
+    colonnes_mots = {}
+
+    lignes, colonnes, poids = [], [], []
+    for id_theme, theme in enumerate(noms):
+        for mot in mots_cles[theme]:
+            lignes.append(id_theme)
+            colonnes.append(colonnes_mots.setdefault(mot, len(colonnes_mots)))
+            poids.append(1.0)
+        # Chaque document graine pèse au total autant que la liste des mots-clés
+        documents = [mots for mots in graines.get(theme, []) if mots]
+        for mots in documents:
+            for mot in mots:
+                lignes.append(id_theme)
+                colonnes.append(colonnes_mots.setdefault(mot, len(colonnes_mots)))
+                poids.append(len(mots_cles[theme]) / (len(mots) * len(documents)))
+
+    # Les doublons (mot-clé répété, mot répété d'une graine) sont additionnés
+    matrice = csr_matrix((poids, (lignes, colonnes)), shape=(len(noms), len(colonnes_mots)), dtype=np.float64)
+    return {"noms": noms, "colonnes": colonnes_mots, "matrice": ponderer_tfidf(matrice, np.ones(len(colonnes_mots)))}
+
+@lru_cache(maxsize=None)
+def centroides_par_defaut(lemmatiser=False):
+    """Centroïdes de themes.json construits une seule fois"""
+    return construire_centroides(lemmatiser=lemmatiser)
+
+def vecteurs_mots_cles(textes_liste_mots, centroides):
+    """
+    Matrice creuse documents × mots des centroïdes, lignes divisées par la norme L2 de tout le
+    document (fréquences brutes) : son produit avec les centroïdes est la similarité cosinus
+    entre le document entier et chaque thème, sans vocabulaire ni IDF propres au lot.
+    """
+    colonnes_mots = centroides["colonnes"]
+    lignes, colonnes, valeurs = [], [], []
+    normes = np.ones(len(textes_liste_mots))
+    for i, mots in enumerate(textes_liste_mots):
+        comptes = Counter(mots)
+        if comptes:
+            normes[i] = np.sqrt(sum(nb * nb for nb in comptes.values()))
+        for mot, nb in comptes.items():
+            colonne = colonnes_mots.get(mot)
+            if colonne is not None:
+                lignes.append(i)
+                colonnes.append(colonne)
+                valeurs.append(nb / normes[i])
+    return csr_matrix(
+        (np.asarray(valeurs, dtype=np.float64), (lignes, colonnes)),
+        shape=(len(textes_liste_mots), len(colonnes_mots)),
+    )
+
+def similarites_themes(X, centroides):
+    """Similarité cosinus documents × thèmes en un seul produit (X : voir vecteurs_mots_cles)"""
+    return (X @ centroides["matrice"].T).toarray()
+
+def themes_probables(similarites, centroides, k=1, seuil=0.0):
+    """
+    Les k thèmes les plus proches de chaque document : liste de [(theme, similarité), ...]
+    Un document dont la meilleure similarité est nulle ou sous le seuil reçoit [("Inconnu", similarité)].
+    """
+    noms = centroides["noms"]
+    k = min(k, len(noms))
+    # Tri stable : le premier thème l'emporte en cas d'égalité, comme dans theme_dominant
+    meilleurs = np.argsort(-similarites, axis=1, kind="stable")[:, :k]
+    resultats = []
+    for ligne, ids in zip(similarites, meilleurs):
+        if ligne[ids[0]] <= 0 or ligne[ids[0]] < seuil:
+            resultats.append([("Inconnu", float(ligne[ids[0]]))])
+        else:
+            resultats.append([(noms[i], float(ligne[i])) for i in ids])
+    return resultats
+
+def classer_corpus(textes_liste_mots, k=1, seuil=0.0, graines=None, lemmatiser=False, taille_lot=10000):
+    """
+    Mode par lots : thèmes les plus proches de chaque texte, par similarité cosinus aux centroïdes
+    - textes_liste_mots : itérable de listes de mots (liste, générateur...), parcouru une fois
+    - graines, lemmatiser : voir construire_centroides (par défaut : centroïdes de themes.json, mis en cache)
+    - taille_lot : nombre de documents vectorisés à la fois (borne la mémoire et la durée d'un lot)
+    Renvoie une liste de [(theme, similarité), ...] par texte (voir themes_probables).
+    """
+    centroides = _centroides(graines, lemmatiser)
+    resultats = []
+    textes = iter(textes_liste_mots)
+    while True:
+        lot = list(islice(textes, taille_lot))
+        if not lot:
+            break
+        X = vecteurs_mots_cles(lot, centroides)
+        resultats.extend(themes_probables(similarites_themes(X, centroides), centroides, k=k, seuil=seuil))
+    return resultats
+
+def vecteurs_comptes(comptes, vocabulaire, centroides):
+    """
+    Équivalent de vecteurs_mots_cles pour une matrice de fréquences documents × vocabulaire
+    (voir corpus_ids.matrice_comptes) : les colonnes sont ramenées aux mots des centroïdes
+    """
+    colonnes_mots = centroides["colonnes"]
+    # Identifiant du vocabulaire → colonne des centroïdes (-1 : mot hors des thèmes)
+    colonnes = np.fromiter((colonnes_mots.get(mot, -1) for mot in vocabulaire), dtype=np.int64, count=len(vocabulaire))
+    normes = np.sqrt(np.asarray(comptes.multiply(comptes).sum(axis=1)).ravel())
+    normes[normes == 0] = 1.0
+    coo = comptes.tocoo()
+    connus = colonnes[coo.col] >= 0
+    return csr_matrix(
+        (coo.data[connus] / normes[coo.row[connus]], (coo.row[connus], colonnes[coo.col[connus]])),
+        shape=(comptes.shape[0], len(colonnes_mots)),
+    )
+
+def classer_corpus_ids(corpus, k=1, seuil=0.0, graines=None, lemmatiser=False, taille_lot=10000):
+    """
+    classer_corpus sur un corpus d'identifiants (voir corpus_ids.py), sans repasser par les chaînes
+    Renvoie une liste de [(theme, similarité), ...] par document.
+    """
+    centroides = _centroides(graines, lemmatiser)
+    comptes = matrice_comptes(corpus, taille_lot)
+    resultats = []
+    for debut in range(0, comptes.shape[0], taille_lot):
+        X = vecteurs_comptes(comptes[debut:debut + taille_lot], corpus["vocabulaire"], centroides)
+        resultats.extend(themes_probables(similarites_themes(X, centroides), centroides, k=k, seuil=seuil))
+    return resultats
+
+def _centroides(graines, lemmatiser):
+    if graines:
+        return construire_centroides(graines=graines, lemmatiser=lemmatiser)
+    return centroides_par_defaut(lemmatiser)